@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 """Export data from Supabase for migration to ParadeDB."""
 
-import json
 import os
 import sys
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
+import msgspec
 from dotenv import load_dotenv
 
 # Add the parent directory to Python path
@@ -16,45 +17,80 @@ from wodrag.database.client import get_supabase_client
 # Load environment variables
 load_dotenv()
 
+# Large I/O buffer so writing the export is bulk copies, not many syscalls
+IO_BUFFER_SIZE = 1 << 20
 
-def export_workouts_to_json(output_file: str = "data/supabase_export.json") -> None:
-    """Export all workouts from Supabase to JSON."""
+# Number of id ranges fetched concurrently
+EXPORT_WORKERS = 8
 
-    try:
-        client = get_supabase_client()
 
-        # Get total count
-        count_result = client.table("workouts").select("id", count="exact").execute()
-        total_count = count_result.count
+def fetch_id_range(
+    client: Any, lo: int, hi: int, batch_size: int = 1000
+) -> list[dict[str, Any]]:
+    """Fetch all workouts with lo <= id < hi using keyset pagination."""
+    workouts: list[dict[str, Any]] = []
+    last_id = lo - 1
 
-        # Export in batches to handle large datasets
-        batch_size = 100
-        all_workouts = []
+    while True:
+        result = (
+            client.table("workouts")
+            .select("*")
+            .gt("id", last_id)
+            .lt("id", hi)
+            .order("id")
+            .limit(batch_size)
+            .execute()
+        )
+        if not result.data:
+            break
 
-        for offset in range(0, total_count, batch_size):
+        workouts.extend(result.data)
+        last_id = result.data[-1]["id"]
 
-            result = (
-                client.table("workouts")
-                .select("*")
-                .order("id")
-                .limit(batch_size)
-                .offset(offset)
-                .execute()
-            )
+        if len(result.data) < batch_size:
+            break
 
-            # Convert date objects to strings for JSON serialization
-            for workout in result.data:
-                if workout.get("date") and isinstance(workout["date"], date):
-                    workout["date"] = workout["date"].isoformat()
+    return workouts
 
-            all_workouts.extend(result.data)
+
+def export_workouts_to_json(output_file: str = "data/supabase_export.json") -> None:
+    """Export all workouts from Supabase to JSON."""
+
+    try:
+        client = get_supabase_client()
+
+        # Find the id span so it can be split into disjoint ranges
+        first = client.table("workouts").select("id").order("id").limit(1).execute()
+        if not first.data:
+            return
+        last = (
+            client.table("workouts")
+            .select("id")
+            .order("id", desc=True)
+            .limit(1)
+            .execute()
+        )
+        min_id = first.data[0]["id"]
+        max_id = last.data[0]["id"] + 1
+
+        step = max(1, -(-(max_id - min_id) // EXPORT_WORKERS))
+        ranges = [(lo, min(lo + step, max_id)) for lo in range(min_id, max_id, step)]
+
+        # Fetch each range concurrently; results come back in id order
+        with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as executor:
+            chunks = executor.map(lambda r: fetch_id_range(client, *r), ranges)
+            all_workouts = [workout for chunk in chunks for workout in chunk]
 
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-        # Write to JSON file
-        with open(output_file, "w") as f:
-            json.dump(all_workouts, f, indent=2, default=str)
+        # Write to JSON file; msgspec encodes dates as ISO strings natively
+        with open(output_file, "wb", buffering=IO_BUFFER_SIZE) as f:
+            f.write(
+                msgspec.json.format(
+                    msgspec.json.encode(all_workouts, enc_hook=str), indent=2
+                )
+            )
 
 
         # Show sample record
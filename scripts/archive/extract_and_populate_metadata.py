@@ -10,27 +10,105 @@ This script:
 """
 
 import logging
+import os
+import queue
 import time
-from datetime import UTC, datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import UTC, date, datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
 from typing import Annotated, Any
 
 import dspy  # type: ignore
+import psycopg2
 import typer
-from postgrest.exceptions import APIError
 
 from wodrag.agents.extract_metadata import extractor
 from wodrag.database import Workout, WorkoutRepository
+from wodrag.database.client import get_pooled_connection
 from wodrag.services import EmbeddingService, WorkoutService
 
-# Configure logging
+# Configure logging: records are queued and written by a listener thread, so
+# the extraction loop never blocks on file or terminal I/O
+LOG_QUEUE: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("metadata_extraction.log"), logging.StreamHandler()],
+    level=logging.INFO, format="%(message)s", handlers=[QueueHandler(LOG_QUEUE)]
 )
 logger = logging.getLogger(__name__)
 
 
+def start_log_listener() -> QueueListener:
+    """Start the thread that writes queued log records to the log file and stderr."""
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers: list[logging.Handler] = [
+        logging.FileHandler("metadata_extraction.log"),
+        logging.StreamHandler(),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    listener = QueueListener(LOG_QUEUE, *handlers)
+    listener.start()
+    return listener
+
+
+# Last (date, id) processed, written after each batch so a run can resume
+CURSOR_FILE = Path("metadata_extraction.cursor")
+# DSPy's on-disk LM response cache, kept with the data so re-runs reuse it
+DSPY_CACHE_DIR = Path("data/.dspy_cache")
+
+VALID_WORKOUT_TYPES = frozenset(
+    {
+        "metcon",
+        "strength",
+        "hero",
+        "girl",
+        "benchmark",
+        "team",
+        "endurance",
+        "skill",
+        "other",
+    }
+)
+# Names the model returns when a workout has none
+PLACEHOLDER_NAMES = frozenset({"none", "n/a", "null"})
+
+
+def parse_cursor(cursor: str) -> tuple[date, int]:
+    """Parse a resume cursor of the form YYYY-MM-DD:ID."""
+    cursor_date, cursor_id = cursor.strip().split(":")
+    return date.fromisoformat(cursor_date), int(cursor_id)
+
+
+def format_cursor(cursor: tuple[date, int]) -> str:
+    """Format a (date, id) resume cursor as YYYY-MM-DD:ID."""
+    return f"{cursor[0].isoformat()}:{cursor[1]}"
+
+
+def save_cursor(cursor: tuple[date, int]) -> None:
+    """Atomically replace the saved cursor, so a crash never leaves it torn."""
+    tmp_file = CURSOR_FILE.with_suffix(".tmp")
+    tmp_file.write_text(format_cursor(cursor))
+    os.replace(tmp_file, CURSOR_FILE)
+
+
+def clear_saved_cursor() -> None:
+    """Forget the saved cursor once a run has reached the end.
+
+    The cursor moves past rows whose extraction failed, so the next run must
+    start over to retry them.
+    """
+    CURSOR_FILE.unlink(missing_ok=True)
+
+
+def load_saved_cursor() -> tuple[date, int] | None:
+    """Load the cursor saved by the last run, if there is one."""
+    try:
+        return parse_cursor(CURSOR_FILE.read_text())
+    except FileNotFoundError:
+        return None
+
+
 class MetadataExtractor:
     """Handles the extraction and population of workout metadata."""
 
@@ -38,16 +116,15 @@ class MetadataExtractor:
         self,
         batch_size: int = 50,
         delay_between_batches: float = 1.0,
-        max_retries: int = 3,
-        retry_delay: float = 5.0,
+        concurrency: int = 8,
     ):
-        self.repository = WorkoutRepository()
+        # Every batch fetch, count and update borrows from one connection pool
+        self.repository = WorkoutRepository(connection_factory=get_pooled_connection)
         self.embedding_service = EmbeddingService()
         self.workout_service = WorkoutService(self.repository, self.embedding_service)
         self.batch_size = batch_size
         self.delay_between_batches = delay_between_batches
-        self.max_retries = max_retries
-        self.retry_delay = retry_delay
+        self.concurrency = concurrency
 
         # Statistics
         self.stats: dict[str, Any] = {
@@ -56,124 +133,115 @@ class MetadataExtractor:
             "failed_extractions": 0,
             "failed_updates": 0,
             "skipped_no_workout": 0,
-            "start_time": datetime.now(UTC),
+            "start_time": time.perf_counter(),
         }
 
     def get_workouts_needing_metadata(
-        self, limit: int | None = None, offset: int = 0
+        self, limit: int | None = None, after: tuple[date, int] | None = None
     ) -> list[Workout]:
-        """Get workouts that need metadata extraction."""
-        try:
-            # Get workouts where one_sentence_summary is null
-            query = self.repository.client.table("workouts").select("*")
-
-            # Only process workouts missing summary (the key metadata field)
-            query = query.is_("one_sentence_summary", "null")
+        """Get workouts that need metadata extraction.
+
+        Pages by the (date, id) keyset: pass the last (date, id) of the
+        previous batch as ``after`` to fetch the next one, so the database
+        never scans and discards rows already handed out. The filter and
+        order match the workouts_need_metadata partial index.
+        """
+        # Only process workouts missing summary (the key metadata field)
+        sql = (
+            "SELECT id, date, workout FROM workouts WHERE one_sentence_summary IS NULL"
+        )
+        values: list[Any] = []
 
-            query = query.order("date", desc=False)  # Process oldest first
+        if after:
+            sql += " AND (date, id) > (%s, %s)"
+            values.extend(after)
 
-            if limit:
-                query = query.limit(limit)
-            if offset:
-                query = query.offset(offset)
+        sql += " ORDER BY date, id"  # Process oldest first
 
-            result = query.execute()
-            return [Workout.from_dict(row) for row in result.data]
+        if limit:
+            sql += " LIMIT %s"
+            values.append(limit)
 
-        except APIError as e:
+        try:
+            with get_pooled_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(sql, values)
+                columns = [desc[0] for desc in cursor.description]
+                return [
+                    Workout.from_dict(dict(zip(columns, row, strict=True)))
+                    for row in cursor.fetchall()
+                ]
+
+        except psycopg2.Error as e:
             logger.error(f"Failed to fetch workouts needing metadata: {e}")
             return []
 
     def get_total_workouts_needing_metadata(self) -> int:
         """Get count of workouts that need metadata extraction."""
         try:
-            # Count workouts where one_sentence_summary is null
-            query = self.repository.client.table("workouts").select("id", count="exact")
-
-            # Only count workouts missing summary (same logic as get_workouts_needing_metadata)
-            query = query.is_("one_sentence_summary", "null")
-
-            result = query.execute()
-            return result.count or 0
-        except APIError as e:
+            with get_pooled_connection() as conn, conn.cursor() as cursor:
+                # Same filter as get_workouts_needing_metadata
+                cursor.execute(
+                    "SELECT COUNT(*) FROM workouts WHERE one_sentence_summary IS NULL"
+                )
+                result = cursor.fetchone()
+                return result[0] if result else 0
+        except psycopg2.Error as e:
             logger.error(f"Failed to count workouts needing metadata: {e}")
             return 0
 
     def extract_metadata_with_retry(self, workout_text: str) -> dict[str, Any] | None:
-        """Extract metadata with retry logic."""
-        for attempt in range(self.max_retries + 1):
-            try:
-                # Extract metadata using the dspy agent
-                result = extractor(workout=workout_text)
-
-                # Validate and clean the results
-                metadata = {
-                    "movements": self._validate_movements(result.movements),
-                    "equipment": self._validate_equipment(result.equipment),
-                    "workout_type": self._validate_workout_type(result.workout_type),
-                    "workout_name": self._validate_workout_name(result.workout_name),
-                    "one_sentence_summary": result.one_sentence_summary.strip(),
-                }
-
-                return metadata
-
-            except Exception as e:
-                logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                if attempt < self.max_retries:
-                    time.sleep(self.retry_delay * (attempt + 1))  # Exponential backoff
-                else:
-                    logger.error(
-                        f"Failed to extract metadata after "
-                        f"{self.max_retries + 1} attempts"
-                    )
+        """Extract metadata, or return None if the model call fails.
 
-        return None
+        Rate limits, timeouts and 5xx responses are retried with backoff by the
+        configured ``dspy.LM`` (``num_retries``), so anything reaching this
+        point is not retried. Any failure only loses this workout, so one bad
+        answer never aborts the batch.
+        """
+        try:
+            result = extractor(workout=workout_text)
+            summary = result.one_sentence_summary
+            # Validate and clean the results
+            return {
+                "movements": self._validate_movements(result.movements),
+                "equipment": self._validate_equipment(result.equipment),
+                "workout_type": self._validate_workout_type(result.workout_type),
+                "workout_name": self._validate_workout_name(result.workout_name),
+                "one_sentence_summary": (
+                    summary.strip() if isinstance(summary, str) else None
+                ),
+            }
+        except Exception as e:
+            logger.error("Failed to extract metadata: %s", e)
+            return None
 
     def _validate_movements(self, movements: Any) -> list[str]:
         """Validate and clean movements list."""
-        if not isinstance(movements, list):
-            return []
-
-        # Clean and deduplicate
-        cleaned = []
-        for movement in movements:
-            if isinstance(movement, str) and movement.strip():
-                cleaned_movement = movement.strip().lower()
-                if cleaned_movement not in cleaned:
-                    cleaned.append(cleaned_movement)
-
-        return cleaned[:20]  # Limit to 20 movements max
+        return self._clean_string_list(movements)[:20]  # Limit to 20 movements max
 
     def _validate_equipment(self, equipment: Any) -> list[str]:
         """Validate and clean equipment list."""
-        if not isinstance(equipment, list):
-            return []
+        return self._clean_string_list(equipment)[:15]  # Limit to 15 items max
 
-        # Clean and deduplicate
-        cleaned = []
-        for item in equipment:
-            if isinstance(item, str) and item.strip():
-                cleaned_item = item.strip().lower()
-                if cleaned_item not in cleaned:
-                    cleaned.append(cleaned_item)
+    def _clean_string_list(self, items: Any) -> list[str]:
+        """Strip, lowercase and deduplicate strings, keeping first-seen order."""
+        if not isinstance(items, list):
+            return []
 
-        return cleaned[:15]  # Limit to 15 equipment items max
+        # dict keys dedupe in one pass and keep insertion order
+        return list(
+            dict.fromkeys(
+                item.strip().lower()
+                for item in items
+                if isinstance(item, str) and item.strip()
+            )
+        )
 
     def _validate_workout_type(self, workout_type: str) -> str | None:
         """Validate workout type."""
-        valid_types = {
-            "metcon",
-            "strength",
-            "hero",
-            "girl",
-            "benchmark",
-            "team",
-            "endurance",
-            "skill",
-            "other",
-        }
-
-        if isinstance(workout_type, str) and workout_type.lower() in valid_types:
+        if (
+            isinstance(workout_type, str)
+            and workout_type.lower() in VALID_WORKOUT_TYPES
+        ):
             return workout_type.lower()
         return None
 
@@ -182,80 +250,103 @@ class MetadataExtractor:
         if isinstance(workout_name, str) and workout_name.strip():
             cleaned = workout_name.strip()
             # Limit length and clean up
-            if len(cleaned) <= 100 and cleaned.lower() not in ["none", "n/a", "null"]:
+            if len(cleaned) <= 100 and cleaned.lower() not in PLACEHOLDER_NAMES:
                 return cleaned
         return None
 
     def update_workout_metadata_batch(self, updates: list[dict[str, Any]]) -> int:
-        """Update multiple workouts with metadata in a batch."""
-        successful_updates = 0
-
-        for update in updates:
+        """Update multiple workouts with metadata in a batch.
+
+        Summary embeddings for the whole batch come from one embeddings call,
+        and every row is written in a single UPDATE.
+        """
+        summaries = [
+            (update["metadata"].get("one_sentence_summary") or "").strip()
+            for update in updates
+        ]
+
+        # Generate embeddings from summaries that exist
+        embeddings: list[list[float]] = [[] for _ in updates]
+        if any(summaries):
             try:
-                workout_id = update["id"]
-                metadata = update["metadata"]
-
-                # Generate embedding from summary if it exists
-                summary_embedding = None
-                one_sentence_summary = metadata.get("one_sentence_summary")
-                if one_sentence_summary and one_sentence_summary.strip():
-                    try:
-                        summary_embedding = self.embedding_service.generate_embedding(
-                            one_sentence_summary.strip()
-                        )
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to generate embedding for workout {workout_id}: {e}"
-                        )
-
-                result = self.repository.update_workout_metadata(
-                    workout_id=workout_id,
-                    movements=metadata.get("movements"),
-                    equipment=metadata.get("equipment"),
-                    workout_type=metadata.get("workout_type"),
-                    workout_name=metadata.get("workout_name"),
-                    one_sentence_summary=one_sentence_summary,
-                    summary_embedding=summary_embedding,
-                )
+                embeddings = self.embedding_service.generate_batch_embeddings(summaries)
+            except RuntimeError as e:
+                logger.warning(f"Failed to generate summary embeddings: {e}")
+
+        rows = [
+            {
+                "id": update["id"],
+                **update["metadata"],
+                "summary_embedding": embedding or None,
+            }
+            for update, embedding in zip(updates, embeddings, strict=True)
+        ]
 
-                if result:
-                    successful_updates += 1
-                    logger.debug(f"Updated workout {workout_id}")
-                else:
-                    logger.warning(f"Failed to update workout {workout_id}")
-                    self.stats["failed_updates"] = int(self.stats["failed_updates"]) + 1
+        try:
+            successful_updates = self.repository.update_workouts_metadata_bulk(rows)
+        except RuntimeError as e:
+            logger.error(f"Error updating batch of {len(updates)} workouts: {e}")
+            successful_updates = 0
 
-            except Exception as e:
-                logger.error(
-                    f"Error updating workout {update.get('id', 'unknown')}: {e}"
-                )
-                self.stats["failed_updates"] = int(self.stats["failed_updates"]) + 1
+        failed = len(updates) - successful_updates
+        if failed:
+            logger.warning(f"Failed to update {failed} workouts")
+            self.stats["failed_updates"] = int(self.stats["failed_updates"]) + failed
 
         return successful_updates
 
+    def extract_batch_metadata(
+        self, workouts: list[Workout]
+    ) -> list[tuple[Workout, dict[str, Any] | None]]:
+        """Extract metadata for workouts concurrently, in input order.
+
+        Each extraction is an LLM round-trip, so up to ``concurrency`` of them
+        run at once on threads. Workouts sharing the same text (rest days,
+        re-posted benchmarks) are extracted once. Repeat runs are served from
+        DSPy's on-disk LM cache, which is keyed by model and prompt.
+        """
+        texts = list(dict.fromkeys(workout.workout or "" for workout in workouts))
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            metadata_by_text = dict(
+                zip(
+                    texts,
+                    executor.map(self.extract_metadata_with_retry, texts),
+                    strict=True,
+                )
+            )
+        return [
+            (workout, metadata_by_text[workout.workout or ""]) for workout in workouts
+        ]
+
     def process_batch(self, workouts: list[Workout]) -> None:
         """Process a batch of workouts."""
         logger.info(f"Processing batch of {len(workouts)} workouts")
 
         updates = []
+        to_extract = []
 
         for workout in workouts:
             self.stats["total_processed"] = int(self.stats["total_processed"]) + 1
 
             # Skip if no workout text
             if not workout.workout or not workout.workout.strip():
-                logger.debug(f"Skipping workout {workout.id} - no workout text")
+                logger.debug("Skipping workout %s - no workout text", workout.id)
                 self.stats["skipped_no_workout"] = (
                     int(self.stats["skipped_no_workout"]) + 1
                 )
                 continue
 
-            # Extract metadata
-            metadata = self.extract_metadata_with_retry(workout.workout)
+            to_extract.append(workout)
 
+        # Extract metadata, folding the results into the stats afterwards
+        for workout, metadata in self.extract_batch_metadata(to_extract):
             if metadata:
                 updates.append({"id": workout.id, "metadata": metadata})
-                logger.debug(f"Extracted metadata for workout {workout.id}: {metadata}")
+                # Debug logging is off by default; skip formatting the dict then
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Extracted metadata for workout %s: %r", workout.id, metadata
+                    )
             else:
                 logger.warning(f"Failed to extract metadata for workout {workout.id}")
                 self.stats["failed_extractions"] = (
@@ -276,21 +367,16 @@ class MetadataExtractor:
         if self.delay_between_batches > 0:
             time.sleep(self.delay_between_batches)
 
+    def _batch_limit(self, limit: int | None, processed_count: int) -> int:
+        """Size of the next batch, shrunk so the run stops at ``limit``."""
+        if limit:
+            return min(self.batch_size, limit - processed_count)
+        return self.batch_size
+
     def print_progress(self) -> None:
         """Print current progress statistics."""
-        start_time = self.stats["start_time"]
-        if isinstance(start_time, datetime):
-            elapsed_time = datetime.now(UTC) - start_time
-            total_processed = int(self.stats["total_processed"])
-            rate = (
-                total_processed / elapsed_time.total_seconds()
-                if elapsed_time.total_seconds() > 0
-                else 0
-            )
-            elapsed_str = str(elapsed_time).split(".")[0]  # Remove microseconds
-        else:
-            elapsed_str = "unknown"
-            rate = 0.0
+        elapsed = time.perf_counter() - float(self.stats["start_time"])
+        rate = int(self.stats["total_processed"]) / elapsed if elapsed > 0 else 0.0
 
         # Get current count of remaining workouts
         remaining = self.get_total_workouts_needing_metadata()
@@ -298,35 +384,39 @@ class MetadataExtractor:
         # Calculate ETA if we have a processing rate
         eta_str = "unknown"
         if rate > 0 and remaining > 0:
-            eta_seconds = remaining / rate
-            eta_time = datetime.now(UTC) + timedelta(seconds=eta_seconds)
+            eta_time = datetime.now(UTC) + timedelta(seconds=remaining / rate)
             eta_str = eta_time.strftime("%H:%M:%S")
 
-        logger.info(f"""
-=== Progress Report ===
-Total Processed: {self.stats["total_processed"]}
-Workouts Remaining: {remaining}
-Successful Updates: {self.stats["successful_updates"]}
-Failed Extractions: {self.stats["failed_extractions"]}
-Failed Updates: {self.stats["failed_updates"]}
-Skipped (No Workout): {self.stats["skipped_no_workout"]}
-Elapsed Time: {elapsed_str}
-Processing Rate: {rate:.2f} workouts/second
-Estimated Completion: {eta_str}
-=======================
-        """)
+        report = "\n".join(
+            [
+                "",
+                "=== Progress Report ===",
+                f"Total Processed: {self.stats['total_processed']}",
+                f"Workouts Remaining: {remaining}",
+                f"Successful Updates: {self.stats['successful_updates']}",
+                f"Failed Extractions: {self.stats['failed_extractions']}",
+                f"Failed Updates: {self.stats['failed_updates']}",
+                f"Skipped (No Workout): {self.stats['skipped_no_workout']}",
+                f"Elapsed Time: {timedelta(seconds=int(elapsed))}",
+                f"Processing Rate: {rate:.2f} workouts/second",
+                f"Estimated Completion: {eta_str}",
+                "=======================",
+            ]
+        )
+        logger.info("%s", report)
 
     def run(
         self,
         limit: int | None = None,
         dry_run: bool = False,
-        resume_from_offset: int = 0,
+        resume_from_cursor: tuple[date, int] | None = None,
     ) -> None:
         """Run the metadata extraction process."""
         logger.info(f"Starting metadata extraction {'(DRY RUN)' if dry_run else ''}")
-        logger.info(
-            f"Batch size: {self.batch_size}, Resume from offset: {resume_from_offset}"
+        resume_str = (
+            format_cursor(resume_from_cursor) if resume_from_cursor else "start"
         )
+        logger.info(f"Batch size: {self.batch_size}, Resume from: {resume_str}")
 
         # Get initial count of workouts needing metadata
         total_needing_metadata = self.get_total_workouts_needing_metadata()
@@ -336,54 +426,76 @@ Estimated Completion: {eta_str}
 
         if total_needing_metadata == 0:
             logger.info("✅ No workouts need metadata extraction!")
+            if not dry_run:
+                clear_saved_cursor()
             return
 
         if dry_run:
             logger.info("DRY RUN MODE - No database updates will be performed")
 
-        offset = resume_from_offset
+        cursor = resume_from_cursor
         processed_count = 0
 
-        while True:
-            # Check if we've already reached the limit
-            if limit and processed_count >= limit:
-                logger.info(f"Reached processing limit of {limit} workouts")
-                break
+        # One background thread fetches the next batch while the current one is
+        # processed. Keyset paging makes this safe: processing only touches
+        # rows at or before the cursor the prefetch starts after.
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            next_batch: Future[list[Workout]] | None = prefetcher.submit(
+                self.get_workouts_needing_metadata,
+                limit=self._batch_limit(limit, processed_count),
+                after=cursor,
+            )
 
-            # Get next batch of workouts
-            # If limit is set and remaining < batch_size, use remaining
-            batch_limit = self.batch_size
-            if limit and (limit - processed_count) < self.batch_size:
-                batch_limit = limit - processed_count
+            while next_batch is not None:
+                workouts = next_batch.result()
 
-            workouts = self.get_workouts_needing_metadata(
-                limit=batch_limit, offset=offset
-            )
+                if not workouts:
+                    logger.info("No more workouts to process")
+                    if not dry_run:
+                        clear_saved_cursor()
+                    break
 
-            if not workouts:
-                logger.info("No more workouts to process")
-                break
+                batch_cursor = (workouts[-1].date, workouts[-1].id)
+                fetched_count = processed_count + len(workouts)
 
-            if not dry_run:
-                self.process_batch(workouts)
-            else:
-                # Dry run - just extract metadata without updating
-                for workout in workouts:
-                    if workout.workout:
-                        metadata = self.extract_metadata_with_retry(workout.workout)
+                # Stop prefetching once the limit is covered
+                if limit and fetched_count >= limit:
+                    next_batch = None
+                else:
+                    next_batch = prefetcher.submit(
+                        self.get_workouts_needing_metadata,
+                        limit=self._batch_limit(limit, fetched_count),
+                        after=batch_cursor,
+                    )
+
+                if not dry_run:
+                    self.process_batch(workouts)
+                else:
+                    # Dry run - just extract metadata without updating
+                    with_text = [workout for workout in workouts if workout.workout]
+                    for workout, metadata in self.extract_batch_metadata(with_text):
                         logger.info(f"Workout {workout.id}: {metadata}")
                         logger.info(f"Original Workout Text: {workout.workout}")
-                self.stats["total_processed"] = int(
-                    self.stats["total_processed"]
-                ) + len(workouts)
+                    self.stats["total_processed"] = int(
+                        self.stats["total_processed"]
+                    ) + len(workouts)
 
-            processed_count += len(workouts)
-            offset += len(workouts)
+                # Drop this batch before waiting on the prefetched one, so no
+                # more than the current and the next batch are held at once
+                del workouts
 
-            # Print progress every 5 batches or every 100 workouts (whichever is smaller)
-            progress_interval = min(self.batch_size * 5, 100)
-            if processed_count % progress_interval == 0 or processed_count < 50:
-                self.print_progress()
+                processed_count = fetched_count
+                cursor = batch_cursor
+                if not dry_run:
+                    save_cursor(cursor)
+
+                # Print progress every 5 batches or every 100 workouts (whichever is smaller)
+                progress_interval = min(self.batch_size * 5, 100)
+                if processed_count % progress_interval == 0 or processed_count < 50:
+                    self.print_progress()
+
+                if next_batch is None:
+                    logger.info(f"Reached processing limit of {limit} workouts")
 
         # Final progress report
         self.print_progress()
@@ -407,12 +519,33 @@ def main(
     dry_run: Annotated[
         bool, typer.Option("--dry-run", help="Run without updating the database")
     ] = False,
-    resume_from_offset: Annotated[
-        int, typer.Option(help="Resume processing from this offset")
-    ] = 0,
+    resume_from_cursor: Annotated[
+        str | None,
+        typer.Option(
+            help="Resume after this YYYY-MM-DD:ID cursor "
+            f"(default: the one saved in {CURSOR_FILE})"
+        ),
+    ] = None,
+    restart: Annotated[
+        bool,
+        typer.Option("--restart", help="Ignore the saved cursor and start over"),
+    ] = False,
     max_retries: Annotated[
-        int, typer.Option(help="Maximum number of retries for failed extractions")
+        int,
+        typer.Option(
+            help="Retries for rate-limited or failed LLM calls (with backoff)"
+        ),
     ] = 3,
+    concurrency: Annotated[
+        int, typer.Option(help="Number of metadata extractions to run at once")
+    ] = 8,
+    cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache",
+            help=f"Reuse LLM responses cached in {DSPY_CACHE_DIR} across runs",
+        ),
+    ] = True,
     model: Annotated[
         str, typer.Option(help="LLM model to use for extraction")
     ] = "openrouter/google/gemini-2.5-flash-lite",
@@ -423,18 +556,31 @@ def main(
     This command processes workouts in the database, extracts metadata using
     an AI model, and updates the database with the extracted information.
     """
+    listener = start_log_listener()
+
     # Configure dspy
-    dspy.configure(lm=dspy.LM(model, max_tokens=100000))
+    dspy.configure_cache(disk_cache_dir=str(DSPY_CACHE_DIR))
+    # The module-level extractor is shared by every worker thread; with
+    # --no-cache its calls skip the cache lookup (and its lock) entirely
+    dspy.configure(
+        lm=dspy.LM(model, max_tokens=100000, num_retries=max_retries, cache=cache)
+    )
 
     # Create and run extractor
     metadata_extractor = MetadataExtractor(
-        batch_size=batch_size, delay_between_batches=delay, max_retries=max_retries
+        batch_size=batch_size,
+        delay_between_batches=delay,
+        concurrency=concurrency,
     )
 
+    # Start from an explicit cursor, else pick up where the last run stopped
+    if resume_from_cursor:
+        cursor = parse_cursor(resume_from_cursor)
+    else:
+        cursor = None if restart else load_saved_cursor()
+
     try:
-        metadata_extractor.run(
-            limit=limit, dry_run=dry_run, resume_from_offset=resume_from_offset
-        )
+        metadata_extractor.run(limit=limit, dry_run=dry_run, resume_from_cursor=cursor)
     except KeyboardInterrupt:
         logger.info("Process interrupted by user")
         metadata_extractor.print_progress()
@@ -442,6 +588,9 @@ def main(
         logger.error(f"Unexpected error: {e}")
         metadata_extractor.print_progress()
         raise
+    finally:
+        # Flushes any queued records before exiting
+        listener.stop()
 
 
 if __name__ == "__main__":
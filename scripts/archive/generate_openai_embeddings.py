@@ -4,10 +4,13 @@
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+import typer
 from dotenv import load_dotenv
 from openai import OpenAI
+from psycopg2.extras import execute_values
 
 # Load environment variables
 load_dotenv()
@@ -16,7 +19,11 @@ load_dotenv()
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from supabase import Client
-from wodrag.database.client import get_supabase_client
+from wodrag.database.client import (
+    format_vector,
+    get_postgres_connection,
+    get_supabase_client,
+)
 
 
 def get_openai_client() -> OpenAI:
@@ -32,13 +39,15 @@ def get_openai_client() -> OpenAI:
 
 
 def fetch_workouts_without_embeddings(
-    client: Client, batch_size: int = 100
+    client: Client, batch_size: int = 100, after_id: int = 0
 ) -> list[dict[str, Any]]:
-    """Fetch workouts that don't have embeddings yet."""
+    """Fetch workouts that don't have embeddings yet, in id order after after_id."""
     result = (
         client.table("workouts")
         .select("id, workout, scaling")
         .is_("workout_embedding", "null")
+        .gt("id", after_id)
+        .order("id")
         .limit(batch_size)
         .execute()
     )
@@ -62,28 +71,45 @@ def process_workouts_batch(
     """Process a batch of workouts - generate embeddings and update database."""
 
     # Prepare texts for embedding (combine workout + scaling)
-    texts = []
-    for workout in workouts:
-        text = workout["workout"]
-        if workout.get("scaling"):
-            text += f" {workout['scaling']}"
-        texts.append(text)
+    texts = [
+        f"{workout['workout']} {workout['scaling']}"
+        if workout["scaling"]
+        else workout["workout"]
+        for workout in workouts
+    ]
 
     # Generate embeddings
     embeddings = generate_openai_embeddings(openai_client, texts)
 
     # Update database
-    success_count = 0
-    for i, workout in enumerate(workouts):
-        try:
-            supabase_client.table("workouts").update(
-                {"workout_embedding": embeddings[i]}
-            ).eq("id", workout["id"]).execute()
-            success_count += 1
-        except Exception:
-            pass
+    return update_workout_embeddings(workouts, embeddings)
 
-    return success_count
+
+def update_workout_embeddings(
+    workouts: list[dict[str, Any]], embeddings: list[list[float]]
+) -> int:
+    """Write a batch of workout embeddings back in a single UPDATE."""
+    rows = [
+        (workout["id"], format_vector(embedding))
+        for workout, embedding in zip(workouts, embeddings, strict=True)
+    ]
+    try:
+        with get_postgres_connection() as conn, conn.cursor() as cursor:
+            execute_values(
+                cursor,
+                """
+                UPDATE workouts SET workout_embedding = data.emb
+                FROM (VALUES %s) AS data(id, emb)
+                WHERE workouts.id = data.id
+                """,
+                rows,
+                template="(%s, %s::vector)",
+                page_size=len(rows),
+            )
+            conn.commit()
+            return cursor.rowcount
+    except Exception:
+        return 0
 
 
 def estimate_cost(total_workouts: int, avg_tokens_per_workout: int = 50) -> float:
@@ -94,7 +120,17 @@ def estimate_cost(total_workouts: int, avg_tokens_per_workout: int = 50) -> floa
     return cost
 
 
-def main() -> None:
+def main(
+    show_total: bool = typer.Option(
+        False, "--show-total", help="Count workouts left first and estimate cost"
+    ),
+    yes: bool = typer.Option(
+        False, "--yes", "-y", help="Start without asking for confirmation"
+    ),
+    max_cost: float | None = typer.Option(
+        None, "--max-cost", help="Abort if the estimated cost (USD) exceeds this"
+    ),
+) -> None:
     """Main function to generate and store embeddings."""
 
     try:
@@ -102,63 +138,76 @@ def main() -> None:
         supabase_client = get_supabase_client()
         openai_client = get_openai_client()
 
-        # Count total workouts without embeddings
-        result = (
-            supabase_client.table("workouts")
-            .select("id", count="exact")
-            .is_("workout_embedding", "null")
-            .execute()
-        )
-        total_count = result.count
-
-        if total_count == 0:
-            return
+        # Counting scans the table, so only do it when asked (or needed for
+        # --max-cost); the batch loop ends on its own once no workouts are left
+        total_count = None
+        if show_total or max_cost is not None:
+            result = (
+                supabase_client.table("workouts")
+                .select("id", count="exact")
+                .is_("workout_embedding", "null")
+                .execute()
+            )
+            total_count = result.count
 
+            if total_count == 0:
+                return
 
-        # Estimate cost
-        estimate_cost(total_count)
+            # Estimate cost
+            if max_cost is not None and estimate_cost(total_count) > max_cost:
+                return
 
-        response = input("Continue? (y/N): ")
-        if response.lower() != "y":
-            return
+        # Unattended runs pass --yes rather than waiting on a prompt
+        if not yes:
+            response = input("Continue? (y/N): ")
+            if response.lower() != "y":
+                return
 
         processed = 0
         success_count = 0
         batch_size = 20  # Process 20 at a time to stay within rate limits
 
 
-        while True:
-            # Fetch next batch
-            workouts = fetch_workouts_without_embeddings(supabase_client, batch_size)
+        # Fetch the next batch on a background thread while the current one is
+        # embedded; paging by id keeps the prefetch clear of rows being updated
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            next_batch = prefetcher.submit(
+                fetch_workouts_without_embeddings, supabase_client, batch_size
+            )
+
+            while True:
+                workouts = next_batch.result()
 
-            if not workouts:
-                break
+                if not workouts:
+                    break
 
+                next_batch = prefetcher.submit(
+                    fetch_workouts_without_embeddings,
+                    supabase_client,
+                    batch_size,
+                    workouts[-1]["id"],
+                )
 
-            # Process batch
-            batch_success = process_workouts_batch(
-                supabase_client, openai_client, workouts
-            )
+                # Process batch
+                batch_success = process_workouts_batch(
+                    supabase_client, openai_client, workouts
+                )
 
-            processed += len(workouts)
-            success_count += batch_success
+                processed += len(workouts)
+                success_count += batch_success
 
-            # Show progress
-            (processed / total_count) * 100
+                # Show progress
+                if total_count:
+                    (processed / total_count) * 100
 
-            # Rate limiting - OpenAI has limits on requests per minute
-            time.sleep(1)  # 1 second between batches
+                # Rate limiting - OpenAI has limits on requests per minute
+                time.sleep(1)  # 1 second between batches
 
 
-        # Verify final count
-        remaining = (
-            supabase_client.table("workouts")
-            .select("id", count="exact")
-            .is_("workout_embedding", "null")
-            .execute()
-        )
+        # Verify nothing is left with a one-row existence check
+        remaining = fetch_workouts_without_embeddings(supabase_client, 1)
 
-        if remaining.count == 0:
+        if not remaining:
             pass
 
     except Exception:
@@ -166,4 +215,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    typer.run(main)
@@ -1,21 +1,48 @@
 #!/usr/bin/env python3
 """Generate OpenAI embeddings from one-sentence summaries and update ParadeDB."""
 
+import asyncio
 import os
 import sys
 import time
 from typing import Any
 
+import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
+from psycopg2.extras import execute_values
 from supabase import Client, create_client
 
 # Add the parent directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
+from wodrag.database.client import format_vector, get_postgres_connection
+
 # Load environment variables
 load_dotenv()
 
+# Number of embedding requests kept in flight at once
+CONCURRENCY = 8
+# Request budget for the embeddings endpoint
+REQUESTS_PER_MINUTE = 3000
+
+
+class AsyncRateLimiter:
+    """Space request starts evenly so we stay under a requests-per-minute cap."""
+
+    def __init__(self, requests_per_minute: int) -> None:
+        self.interval = 60.0 / requests_per_minute
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
 
 def get_supabase_client() -> Client:
     """Create and return a Supabase client."""
@@ -28,8 +55,8 @@ def get_supabase_client() -> Client:
     return create_client(url, key)
 
 
-def get_openai_client() -> OpenAI:
-    """Create and return an OpenAI client."""
+def get_openai_client() -> AsyncOpenAI:
+    """Create and return an async OpenAI client."""
     api_key = os.getenv("OPENAI_API_KEY")
 
     if not api_key:
@@ -37,67 +64,114 @@ def get_openai_client() -> OpenAI:
             "Missing OpenAI API key. Please set OPENAI_API_KEY in your .env file"
         )
 
-    return OpenAI(api_key=api_key)
+    # One shared HTTP/2 client lets concurrent requests multiplex over a
+    # single TLS connection instead of handshaking per connection
+    http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=32),
+    )
+    return AsyncOpenAI(api_key=api_key, http_client=http_client)
 
 
 def fetch_workouts_without_embeddings(
-    client: Client, batch_size: int = 100
+    client: Client, batch_size: int = 100, after_id: int = 0
 ) -> list[dict[str, Any]]:
-    """Fetch workouts that have summaries but don't have summary embeddings yet."""
+    """Fetch workouts that have summaries but don't have summary embeddings yet.
+
+    Rows are returned in id order starting after after_id, so concurrent
+    batches never pick up the same rows before their updates land.
+    """
     result = (
         client.table("workouts")
         .select("id, one_sentence_summary")
         .is_("summary_embedding", "null")
         .not_.is_("one_sentence_summary", "null")
+        .gt("id", after_id)
+        .order("id")
         .limit(batch_size)
         .execute()
     )
     return result.data
 
 
-def generate_openai_embeddings(
-    openai_client: OpenAI, texts: list[str], model: str = "text-embedding-3-small"
+async def generate_openai_embeddings(
+    openai_client: AsyncOpenAI,
+    texts: list[str],
+    model: str = "text-embedding-3-small",
 ) -> list[list[float]]:
     """Generate embeddings using OpenAI API."""
     try:
-        response = openai_client.embeddings.create(input=texts, model=model)
+        response = await openai_client.embeddings.create(input=texts, model=model)
         return [embedding.embedding for embedding in response.data]
     except Exception:
         raise
 
 
-def process_workouts_batch(
-    supabase_client: Client, openai_client: OpenAI, workouts: list[dict[str, Any]]
+def update_summary_embeddings(
+    workouts: list[dict[str, Any]], embeddings: list[list[float]]
+) -> int:
+    """Write a batch of summary embeddings back in a single UPDATE."""
+    rows = [
+        (workout["id"], format_vector(embedding))
+        for workout, embedding in zip(workouts, embeddings, strict=True)
+    ]
+    try:
+        with get_postgres_connection() as conn, conn.cursor() as cursor:
+            execute_values(
+                cursor,
+                """
+                UPDATE workouts SET summary_embedding = data.emb
+                FROM (VALUES %s) AS data(id, emb)
+                WHERE workouts.id = data.id
+                """,
+                rows,
+                template="(%s, %s::vector)",
+                page_size=len(rows),
+            )
+            conn.commit()
+            return cursor.rowcount
+    except Exception:
+        return 0
+
+
+async def process_workouts_batch(
+    openai_client: AsyncOpenAI,
+    workouts: list[dict[str, Any]],
+    semaphore: asyncio.Semaphore,
+    limiter: AsyncRateLimiter,
 ) -> int:
     """Process a batch of workouts - generate embeddings and update database."""
 
-    # Prepare texts for embedding (use one_sentence_summary)
-    texts = []
+    # Prepare texts for embedding (use one_sentence_summary), sending each
+    # distinct summary only once
+    unique_texts: dict[str, int] = {}
+    text_index = []
     valid_workouts = []
     for workout in workouts:
         summary = workout.get("one_sentence_summary")
         if summary and summary.strip():
-            texts.append(summary.strip())
+            index = unique_texts.setdefault(summary.strip(), len(unique_texts))
+            text_index.append(index)
             valid_workouts.append(workout)
 
-    if not texts:
+    if not unique_texts:
         return 0
 
     # Generate embeddings
-    embeddings = generate_openai_embeddings(openai_client, texts)
+    async with semaphore:
+        await limiter.acquire()
+        unique_embeddings = await generate_openai_embeddings(
+            openai_client, list(unique_texts)
+        )
 
-    # Update database
-    success_count = 0
-    for i, workout in enumerate(valid_workouts):
-        try:
-            supabase_client.table("workouts").update(
-                {"summary_embedding": embeddings[i]}
-            ).eq("id", workout["id"]).execute()
-            success_count += 1
-        except Exception:
-            pass
+    # Scatter results back to every workout sharing a summary
+    embeddings = [unique_embeddings[index] for index in text_index]
 
-    return success_count
+    # Update database without blocking the other in-flight batches
+    return await asyncio.to_thread(
+        update_summary_embeddings, valid_workouts, embeddings
+    )
 
 
 def estimate_cost(total_workouts: int, avg_tokens_per_summary: int = 20) -> float:
@@ -109,6 +183,48 @@ def estimate_cost(total_workouts: int, avg_tokens_per_summary: int = 20) -> floa
     return cost
 
 
+async def embed_all_summaries(
+    supabase_client: Client, openai_client: AsyncOpenAI, batch_size: int
+) -> tuple[int, int]:
+    """Embed every pending summary, keeping CONCURRENCY batches in flight.
+
+    Returns (processed, success_count).
+    """
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    limiter = AsyncRateLimiter(REQUESTS_PER_MINUTE)
+
+    processed = 0
+    success_count = 0
+    last_id = 0
+
+    while True:
+        # Fetch enough rows to fill every concurrent slot
+        workouts = fetch_workouts_without_embeddings(
+            supabase_client, batch_size * CONCURRENCY, after_id=last_id
+        )
+
+        if not workouts:
+            break
+
+        last_id = workouts[-1]["id"]
+        batches = [
+            workouts[i : i + batch_size] for i in range(0, len(workouts), batch_size)
+        ]
+
+        # Process batches concurrently
+        results = await asyncio.gather(
+            *(
+                process_workouts_batch(openai_client, batch, semaphore, limiter)
+                for batch in batches
+            )
+        )
+
+        processed += len(workouts)
+        success_count += sum(results)
+
+    return processed, success_count
+
+
 def main() -> None:
     """Main function to generate and store embeddings."""
 
@@ -138,33 +254,9 @@ def main() -> None:
         if response.lower() != "y":
             return
 
-        processed = 0
-        success_count = 0
-        batch_size = 20  # Process 20 at a time to stay within rate limits
-
-
-        while True:
-            # Fetch next batch
-            workouts = fetch_workouts_without_embeddings(supabase_client, batch_size)
-
-            if not workouts:
-                break
-
-
-            # Process batch
-            batch_success = process_workouts_batch(
-                supabase_client, openai_client, workouts
-            )
-
-            processed += len(workouts)
-            success_count += batch_success
-
-            # Show progress
-            (processed / total_count) * 100
-
-            # Rate limiting - OpenAI has limits on requests per minute
-            time.sleep(1)  # 1 second between batches
+        batch_size = 20  # Texts per embedding request
 
+        asyncio.run(embed_all_summaries(supabase_client, openai_client, batch_size))
 
         # Verify final count
         remaining = (
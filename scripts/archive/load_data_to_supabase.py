@@ -1,17 +1,34 @@
 #!/usr/bin/env python3
 """Load workout data from JSON files into Supabase."""
 
-import json
+import csv
+import io
+import mmap
 import os
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
+import msgspec
 from dotenv import load_dotenv
 from supabase import Client, create_client
 
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from wodrag.database.client import get_postgres_connection
+
 # Load environment variables
 load_dotenv()
 
+# Marker COPY reads as NULL; unquoted empty fields stay empty strings
+COPY_NULL = r"\N"
+# Month files decoded ahead of the insert loop; bounds rows held in memory
+MAX_FILES_IN_FLIGHT = 2 * (os.cpu_count() or 1)
+
 
 def get_supabase_client() -> Client:
     """Create and return a Supabase client."""
@@ -27,55 +44,110 @@ def get_supabase_client() -> Client:
     return create_client(url, key)
 
 
-def convert_workout_for_db(workout: dict[str, Any]) -> dict[str, Any]:
-    """Convert workout data from JSON format to database format."""
-    return {
-        "date": workout["date"],
-        "url": workout.get("url", ""),
-        "raw_text": workout["raw_text"],
-        "workout": workout["workout"],
-        "scaling": workout.get("scaling"),
-        "has_video": workout.get("has_video", False),
-        "has_article": workout.get("has_article", False),
-        "month_file": workout.get("month_file", ""),
-    }
-
-
-def load_workouts_from_json_files(json_dir: Path) -> list[dict[str, Any]]:
-    """Load all workouts from JSON files in the given directory."""
-    all_workouts = []
-    json_files = sorted(json_dir.glob("*.json"))
-
-
-    for json_file in json_files:
-
-        with open(json_file, encoding="utf-8") as f:
-            workouts = json.load(f)
-
-        # Convert each workout to database format
-        db_workouts = [convert_workout_for_db(w) for w in workouts]
-        all_workouts.extend(db_workouts)
-
-    return all_workouts
-
-
-def bulk_insert_workouts(
-    client: Client, workouts: list[dict[str, Any]], batch_size: int = 1000
-) -> None:
-    """Insert workouts into Supabase in batches."""
-    total_workouts = len(workouts)
-
-    for i in range(0, total_workouts, batch_size):
-        batch = workouts[i : i + batch_size]
-        i // batch_size + 1
-        (total_workouts + batch_size - 1) // batch_size
-
+class WorkoutRecord(msgspec.Struct, kw_only=True):
+    """Workout columns loaded into the database, with JSON defaults."""
+
+    date: str
+    url: str = ""
+    raw_text: str
+    workout: str
+    scaling: str | None = None
+    has_video: bool = False
+    has_article: bool = False
+    month_file: str = ""
+
+
+_WORKOUTS_DECODER = msgspec.json.Decoder(list[WorkoutRecord])
+WORKOUT_COLUMNS = WorkoutRecord.__struct_fields__
+
+
+def _load_and_convert(json_file: str) -> list[tuple[Any, ...]]:
+    """Decode one month file straight into database-format workout rows.
+
+    Decoding into a typed struct fills defaults and drops unused keys in
+    msgspec's C decoder, instead of building and re-copying a dict per
+    workout in Python. The file is memory-mapped and decoded in place, so
+    it is never copied into an intermediate bytes object.
+    """
+    with (
+        open(json_file, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        workouts = _WORKOUTS_DECODER.decode(mm)
+    return [msgspec.structs.astuple(w) for w in workouts]
+
+
+def load_workouts_from_json_files(
+    json_dir: Path, batch_size: int = 10000
+) -> Iterator[list[tuple[Any, ...]]]:
+    """Yield batches of database-ready workouts from the JSON files in json_dir.
+
+    Files are decoded and converted in parallel worker processes, in file
+    order, and rows are handed off in batches so the full archive is never
+    held in memory at once. At most MAX_FILES_IN_FLIGHT files are decoded
+    ahead of the consumer, so a slow insert cannot let decoded months pile up.
+    """
+    batch: list[tuple[Any, ...]] = []
+    # scandir reports names and types straight from the directory read,
+    # without building a Path and stat-ing each entry like glob does
+    with os.scandir(json_dir) as entries:
+        json_files = sorted(
+            entry.path
+            for entry in entries
+            if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+        )
 
-        try:
-            client.table("workouts").insert(batch).execute()
-        except Exception:
-            # You might want to save failed batches to retry later
-            continue
+    with ProcessPoolExecutor() as executor:
+        pending: deque[Future[list[tuple[Any, ...]]]] = deque()
+        files = iter(json_files)
+        for json_file in files:
+            pending.append(executor.submit(_load_and_convert, json_file))
+            if len(pending) >= MAX_FILES_IN_FLIGHT:
+                break
+
+        while pending:
+            db_workouts = pending.popleft().result()
+            next_file = next(files, None)
+            if next_file is not None:
+                pending.append(executor.submit(_load_and_convert, next_file))
+            for db_workout in db_workouts:
+                batch.append(db_workout)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+    if batch:
+        yield batch
+
+
+def bulk_insert_workouts(batches: Iterable[list[tuple[Any, ...]]]) -> None:
+    """COPY batches of workout rows into the database.
+
+    Each batch is serialized to CSV in memory and streamed through
+    COPY FROM STDIN, which skips per-row INSERT parsing on the server.
+    """
+    columns = ", ".join(WORKOUT_COLUMNS)
+    sql = (
+        f"COPY workouts ({columns}) FROM STDIN "
+        f"WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+
+    with get_postgres_connection() as conn, conn.cursor() as cursor:
+        for batch in batches:
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerows(
+                tuple(COPY_NULL if value is None else value for value in row)
+                for row in batch
+            )
+            buf.seek(0)
+            try:
+                cursor.copy_expert(sql, buf)
+                conn.commit()
+            except Exception:
+                # You might want to save failed batches to retry later
+                conn.rollback()
+                continue
 
 
 def main() -> None:
@@ -95,7 +167,7 @@ def main() -> None:
         if not json_dir.exists():
             return
 
-        workouts = load_workouts_from_json_files(json_dir)
+        batches = load_workouts_from_json_files(json_dir)
 
         # Check if we already have data in the database
         existing_count = client.table("workouts").select("id", count="exact").execute()
@@ -106,8 +178,8 @@ def main() -> None:
             if response.lower() != "y":
                 return
 
-        # Insert workouts into Supabase
-        bulk_insert_workouts(client, workouts)
+        # Insert workouts into the database
+        bulk_insert_workouts(batches)
 
         # Verify insertion
         client.table("workouts").select("id", count="exact").execute()
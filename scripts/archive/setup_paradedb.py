@@ -2,10 +2,17 @@
 """Setup script for migrating to ParadeDB."""
 
 import os
+import socket
 import subprocess
 import sys
 import time
 
+PSQL = "docker exec -i wodrag_paradedb psql -U postgres -d wodrag -v ON_ERROR_STOP=1"
+SUMMARY_HNSW_INDEX = "workouts_summary_embedding_half_hnsw"
+SUMMARY_HNSW_MIGRATION = "sql/paradedb/008_summary_embedding_hnsw.sql"
+NORMALIZE_EMBEDDINGS_MIGRATION = "sql/paradedb/009_normalize_embeddings.sql"
+POSTGRES_ADDRESS = ("127.0.0.1", 5432)
+
 
 def run_command(cmd: str, description: str) -> bool:
     """Run a shell command and return success status."""
@@ -18,23 +25,35 @@ def run_command(cmd: str, description: str) -> bool:
         return False
 
 
-def wait_for_postgres(max_attempts: int = 30) -> bool:
-    """Wait for PostgreSQL to be ready."""
+def port_is_open(address: tuple[str, int] = POSTGRES_ADDRESS) -> bool:
+    """Check whether something accepts TCP connections on the address."""
+    with socket.socket() as sock:
+        sock.settimeout(1)
+        return sock.connect_ex(address) == 0
+
+
+def wait_for_postgres(max_attempts: int = 300) -> bool:
+    """Wait for PostgreSQL to be ready.
+
+    Polls the published port, which costs almost nothing, and only runs
+    pg_isready inside the container once the port accepts connections.
+    """
 
     for _attempt in range(max_attempts):
-        try:
-            result = subprocess.run(
-                "docker exec wodrag_paradedb pg_isready -U postgres -d wodrag",
-                shell=True,
-                capture_output=True,
-                text=True,
-            )
-            if result.returncode == 0:
-                return True
-        except Exception:
-            pass
-
-        time.sleep(2)
+        if port_is_open():
+            try:
+                result = subprocess.run(
+                    "docker exec wodrag_paradedb pg_isready -U postgres -d wodrag",
+                    shell=True,
+                    capture_output=True,
+                    text=True,
+                )
+                if result.returncode == 0:
+                    return True
+            except Exception:
+                pass
+
+        time.sleep(0.2)
 
     return False
 
@@ -58,12 +77,31 @@ def main():
     if not os.path.exists("data/supabase_export.json"):
         sys.exit(1)
 
+    # The HNSW index is much faster to build over loaded rows than to update
+    # row by row during the import, so drop it now and build it afterwards
+    if not run_command(
+        f'{PSQL} -c "DROP INDEX IF EXISTS {SUMMARY_HNSW_INDEX}"',
+        "Drop summary embedding index",
+    ):
+        sys.exit(1)
+
     # Import the data
     if not run_command(
         "uv run python scripts/import_to_paradedb.py", "Import data to ParadeDB"
     ):
         sys.exit(1)
 
+    # Normalize before building the index, so no indexed vector is rewritten
+    if not run_command(
+        f"{PSQL} < {NORMALIZE_EMBEDDINGS_MIGRATION}", "Normalize embeddings"
+    ):
+        sys.exit(1)
+
+    if not run_command(
+        f"{PSQL} < {SUMMARY_HNSW_MIGRATION}", "Build summary embedding index"
+    ):
+        sys.exit(1)
+
 
 
 if __name__ == "__main__":
@@ -1,17 +1,24 @@
 #!/usr/bin/env python3
 """Incrementally update workout database with new workouts."""
 
+import asyncio
 import os
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
 from openai import OpenAI
 from supabase import Client, create_client
 
-from wodrag.data_processing.downloader import download_workout_month
+from wodrag.data_processing.downloader import (
+    download_month,
+    download_months,
+    generate_months,
+)
 from wodrag.data_processing.extractor import extract_workouts_from_month
 from wodrag.data_processing.simple_parser import parse_workout_simple
+from wodrag.services.embedding_service import chunk_texts
 
 # Load environment variables
 load_dotenv()
@@ -60,58 +67,54 @@ def get_latest_workout_date(client: Client) -> str | None:
 def get_months_to_update(latest_date: str | None) -> list[str]:
     """Determine which months need to be updated."""
     current_date = datetime.now()
-    months_to_update = []
 
     if latest_date is None:
         # No data exists, start from 2001-02
-        start_date = datetime(2001, 2, 1)
+        start_year, start_month = 2001, 2
     else:
         # Start from the month of the latest workout
         latest_dt = datetime.strptime(latest_date, "%Y-%m-%d")
-        start_date = datetime(latest_dt.year, latest_dt.month, 1)
+        start_year, start_month = latest_dt.year, latest_dt.month
 
-    # Generate months from start_date to current month
-    date_iter = start_date
-    while date_iter <= current_date:
-        months_to_update.append(date_iter.strftime("%Y-%m"))
-        # Move to next month
-        if date_iter.month == 12:
-            date_iter = date_iter.replace(year=date_iter.year + 1, month=1)
-        else:
-            date_iter = date_iter.replace(month=date_iter.month + 1)
+    # Generate months from the start month to current month
+    return [
+        f"{year}-{month:02d}"
+        for year, month in generate_months(
+            start_year, start_month, current_date.year, current_date.month
+        )
+    ]
 
-    return months_to_update
 
+def get_existing_workout_keys(client: Client, dates: list[str]) -> set[tuple[str, str]]:
+    """Get the (date, url) keys already stored for any of the given dates."""
+    result = client.table("workouts").select("date, url").in_("date", dates).execute()
+    return {(row["date"], row["url"]) for row in result.data}
 
-def workout_exists(client: Client, date: str, url: str) -> bool:
-    """Check if a workout already exists in the database."""
-    result = (
-        client.table("workouts").select("id").eq("date", date).eq("url", url).execute()
-    )
-    return len(result.data) > 0
 
+def generate_embeddings(openai_client: OpenAI, texts: list[str]) -> list[list[float]]:
+    """Generate embeddings for many texts in as few requests as possible."""
+    embeddings: list[list[float]] = []
+    for chunk in chunk_texts(texts):
+        response = openai_client.embeddings.create(
+            input=chunk, model="text-embedding-3-small"
+        )
+        embeddings.extend(data.embedding for data in response.data)
+    return embeddings
 
-def generate_embedding(openai_client: OpenAI, text: str) -> list[float]:
-    """Generate embedding for a single text."""
-    response = openai_client.embeddings.create(
-        input=[text], model="text-embedding-3-small"
-    )
-    return response.data[0].embedding
+
+def build_embedding_text(workout: dict[str, Any]) -> str:
+    """Build the embedding text for a workout (workout + scaling)."""
+    embedding_text = workout["workout"]
+    if workout.get("scaling"):
+        embedding_text += f" {workout['scaling']}"
+    return embedding_text
 
 
 def insert_workout_with_embedding(
-    client: Client, openai_client: OpenAI, workout: dict[str, Any]
+    client: Client, workout: dict[str, Any], embedding: list[float]
 ) -> bool:
     """Insert a single workout with its embedding."""
     try:
-        # Generate embedding text (workout + scaling)
-        embedding_text = workout["workout"]
-        if workout.get("scaling"):
-            embedding_text += f" {workout['scaling']}"
-
-        # Generate embedding
-        embedding = generate_embedding(openai_client, embedding_text)
-
         # Insert workout with embedding
         # Note: summary_embedding will be generated later when metadata is extracted
         client.table("workouts").insert(
@@ -147,7 +150,7 @@ def update_month(
     month_file = f"data/raw/{year_month}.html"
 
     if force_redownload or not os.path.exists(month_file):
-        success = download_workout_month(int(year), int(month))
+        success = download_month(int(year), int(month), Path("data/raw"))
         if not success:
             return 0
 
@@ -157,11 +160,12 @@ def update_month(
     if not workouts:
         return 0
 
-    # Process each workout
-    new_count = 0
+    # Collect the workouts that are not in the database yet
+    new_workouts = []
+    existing = get_existing_workout_keys(client, [w["date"] for w in workouts])
     for workout_data in workouts:
         # Check if workout already exists
-        if workout_exists(client, workout_data["date"], workout_data["url"]):
+        if (workout_data["date"], workout_data["url"]) in existing:
             continue
 
         # Parse workout
@@ -179,8 +183,23 @@ def update_month(
             "month_file": year_month,
         }
 
-        # Insert with embedding
-        if insert_workout_with_embedding(client, openai_client, workout):
+        new_workouts.append(workout)
+
+    if not new_workouts:
+        return 0
+
+    # Generate all embeddings for the month in batched requests
+    try:
+        embeddings = generate_embeddings(
+            openai_client, [build_embedding_text(w) for w in new_workouts]
+        )
+    except Exception:
+        return 0
+
+    # Insert with embedding
+    new_count = 0
+    for workout, embedding in zip(new_workouts, embeddings, strict=True):
+        if insert_workout_with_embedding(client, workout, embedding):
             new_count += 1
 
     return new_count
@@ -204,6 +223,14 @@ def main() -> None:
             return
 
 
+        # Download all months concurrently before processing them
+        asyncio.run(
+            download_months(
+                [(int(m[:4]), int(m[5:7])) for m in months_to_update],
+                Path("data/raw"),
+            )
+        )
+
         # Update each month
         total_new = 0
         for month in months_to_update:
@@ -21,9 +21,12 @@ Usage:
   uv run python scripts/update_paradedb.py --auto
 """
 
+import asyncio
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
 import typer
 from dotenv import load_dotenv
@@ -33,10 +36,10 @@ from openai import OpenAI
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from wodrag.agents.extract_metadata import extractor
-from wodrag.data_processing.downloader import download_month
+from wodrag.data_processing.downloader import download_month, download_months
 from wodrag.data_processing.extractor import extract_workouts_from_file
 from wodrag.data_processing.simple_parser import parse_workout_simple
-from wodrag.database.client import get_postgres_connection
+from wodrag.database.client import format_vector, get_postgres_connection
 from wodrag.services.embedding_service import EmbeddingService
 
 # Load environment variables
@@ -44,6 +47,9 @@ load_dotenv()
 
 app = typer.Typer()
 
+# Concurrent DSPy metadata extractions (each one is an LLM round-trip)
+EXTRACT_WORKERS = 12
+
 
 def get_openai_client() -> OpenAI:
     """Create and return an OpenAI client."""
@@ -61,78 +67,100 @@ def get_latest_workout_date() -> str | None:
         return result[0].isoformat() if result else None
 
 
-def workout_exists(date: str, url: str) -> bool:
-    """Check if a workout already exists in the database."""
+def get_existing_workout_keys(dates: list[str]) -> set[tuple[str, str]]:
+    """Get the (date, url) keys already stored for any of the given dates."""
     with get_postgres_connection() as conn, conn.cursor() as cursor:
         cursor.execute(
-            "SELECT 1 FROM workouts WHERE date = %s AND url = %s", (date, url)
+            "SELECT date, url FROM workouts WHERE date = ANY(%s::date[])", (dates,)
         )
-        return cursor.fetchone() is not None
+        return {(row[0].isoformat(), row[1]) for row in cursor.fetchall()}
 
 
-def insert_workout_complete(
-    workout_data: dict, openai_client: OpenAI, embedding_service: EmbeddingService
-) -> bool:
-    """Insert a workout with complete metadata and embeddings."""
-    try:
-        # Parse basic workout content
-        parsed = parse_workout_simple(workout_data["raw_text"])
+def prepare_workout(workout_data: dict) -> tuple[dict, object, str]:
+    """Parse a workout and extract its metadata and summary."""
+    # Parse basic workout content
+    parsed = parse_workout_simple(workout_data["raw_text"])
 
-        # Extract metadata using AI
-        metadata = extractor(parsed["workout"])
+    # Extract metadata using AI
+    metadata = extractor(parsed["workout"])
 
-        # Generate summary using AI (simplified for now)
-        summary = f"A {metadata.workout_type or 'CrossFit'} workout involving {', '.join(metadata.movements[:3]) if metadata.movements else 'various movements'}"
+    # Generate summary using AI (simplified for now)
+    summary = f"A {metadata.workout_type or 'CrossFit'} workout involving {', '.join(metadata.movements[:3]) if metadata.movements else 'various movements'}"
 
-        # Generate embeddings
-        workout_text = parsed["workout"]
-        if parsed["scaling"]:
-            workout_text += f" {parsed['scaling']}"
+    return parsed, metadata, summary
 
-        workout_embedding = embedding_service.generate_embedding(workout_text)
-        summary_embedding = embedding_service.generate_embedding(summary)
 
-        # Insert into database
-        with get_postgres_connection() as conn, conn.cursor() as cursor:
-            sql = """
-                INSERT INTO workouts (
-                    date, url, raw_text, workout, scaling,
-                    has_video, has_article, month_file,
-                    movements, equipment, workout_type, workout_name,
-                    one_sentence_summary, workout_embedding, summary_embedding
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                )
-                """
-            cursor.execute(
-                sql,
-                (
-                    workout_data["date"],
-                    workout_data["url"],
-                    workout_data["raw_text"],
-                    parsed["workout"],
-                    parsed["scaling"],
-                    workout_data["has_video"],
-                    workout_data["has_article"],
-                    workout_data["month_file"],
-                    metadata.movements,
-                    metadata.equipment,
-                    metadata.workout_type,
-                    metadata.workout_name,
-                    summary,
-                    workout_embedding,
-                    summary_embedding,
-                ),
-            )
-            conn.commit()
+def try_prepare_workout(workout_data: dict) -> tuple[dict, object, str] | None:
+    """Prepare a workout, or return None if parsing or extraction fails."""
+    try:
+        return prepare_workout(workout_data)
+    except Exception:
+        return None
+
 
-        return True
+def insert_workout_complete(
+    cursor,
+    workout_data: dict,
+    parsed: dict,
+    metadata: object,
+    summary: str,
+    workout_embedding: list[float],
+    summary_embedding: list[float],
+) -> bool:
+    """Insert a workout with complete metadata and embeddings.
+
+    Runs inside a savepoint on the caller's transaction, so a failed row is
+    rolled back without losing the rows inserted before it.
+    """
+    cursor.execute("SAVEPOINT workout_insert")
+    try:
+        sql = """
+            INSERT INTO workouts (
+                date, url, raw_text, workout, scaling,
+                has_video, has_article, month_file,
+                movements, equipment, workout_type, workout_name,
+                one_sentence_summary, workout_embedding, summary_embedding
+            ) VALUES (
+                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+            )
+            ON CONFLICT DO NOTHING
+            """
+        cursor.execute(
+            sql,
+            (
+                workout_data["date"],
+                workout_data["url"],
+                workout_data["raw_text"],
+                parsed["workout"],
+                parsed["scaling"],
+                workout_data["has_video"],
+                workout_data["has_article"],
+                workout_data["month_file"],
+                metadata.movements,
+                metadata.equipment,
+                metadata.workout_type,
+                metadata.workout_name,
+                summary,
+                format_vector(workout_embedding),
+                format_vector(summary_embedding),
+            ),
+        )
+        # rowcount is 0 when the workout was already stored
+        inserted = cursor.rowcount == 1
 
     except Exception:
+        cursor.execute("ROLLBACK TO SAVEPOINT workout_insert")
         return False
 
+    cursor.execute("RELEASE SAVEPOINT workout_insert")
+    return inserted
+
 
-def process_month(year_month: str, force_redownload: bool = False) -> int:
+async def process_month(
+    year_month: str,
+    embedding_service: EmbeddingService,
+    force_redownload: bool = False,
+) -> int:
     """Process a single month. Returns number of new workouts added."""
 
     year, month = year_month.split("-")
@@ -157,23 +185,68 @@ def process_month(year_month: str, force_redownload: bool = False) -> int:
     # Convert to dict format
     workouts = [workout.asdict() for workout in workouts]
 
-    # 3. Process each workout
-    openai_client = get_openai_client()
-    embedding_service = EmbeddingService()
+    # 3. Parse new workouts and extract their metadata concurrently; DSPy is
+    # sync-only, so use threads
+    existing = get_existing_workout_keys([w["date"] for w in workouts])
+    new_workouts = [w for w in workouts if (w["date"], w["url"]) not in existing]
+    with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as executor:
+        results = list(executor.map(try_prepare_workout, new_workouts))
+    prepared = [
+        (workout_data, *result)
+        for workout_data, result in zip(new_workouts, results, strict=True)
+        if result is not None
+    ]
+
+    if not prepared:
+        return 0
 
-    new_count = 0
-    for workout_data in workouts:
-        # Skip if already exists
-        if workout_exists(workout_data["date"], workout_data["url"]):
-            continue
+    # 4. Embed all workout texts and summaries for the month in batched calls
+    texts = []
+    for _, parsed, _, _ in prepared:
+        workout_text = parsed["workout"]
+        if parsed["scaling"]:
+            workout_text += f" {parsed['scaling']}"
+        texts.append(workout_text)
+    texts += [summary for _, _, _, summary in prepared]
 
-        # Insert with complete processing
-        if insert_workout_complete(workout_data, openai_client, embedding_service):
-            new_count += 1
+    try:
+        embeddings = await embedding_service.generate_batch_embeddings_async(texts)
+    except (RuntimeError, ValueError):
+        return 0
+
+    # 5. Insert with complete processing over one connection, committing once
+    new_count = 0
+    with get_postgres_connection() as conn, conn.cursor() as cursor:
+        for i, (workout_data, parsed, metadata, summary) in enumerate(prepared):
+            if insert_workout_complete(
+                cursor,
+                workout_data,
+                parsed,
+                metadata,
+                summary,
+                embeddings[i],
+                embeddings[len(prepared) + i],
+            ):
+                new_count += 1
+        conn.commit()
 
     return new_count
 
 
+async def process_months(months: list[str]) -> int:
+    """Process months in order. Returns total number of new workouts added."""
+    # Fetch every month up front over one HTTP/2 client; process_month then
+    # finds the files already on disk
+    await download_months([(int(m[:4]), int(m[5:7])) for m in months], Path("data/raw"))
+
+    # One service for the whole run keeps its HTTP connections alive
+    embedding_service = EmbeddingService()
+    total_new = 0
+    for month in months:
+        total_new += await process_month(month, embedding_service)
+    return total_new
+
+
 @app.command()
 def update_month(
     month: str = typer.Argument(..., help="Month to update (YYYY-MM format)"),
@@ -183,7 +256,7 @@ def update_month(
 ) -> None:
     """Update a specific month of workouts."""
     try:
-        process_month(month, force_redownload)
+        asyncio.run(process_month(month, EmbeddingService(), force_redownload))
 
     except Exception:
         sys.exit(1)
@@ -211,10 +284,7 @@ def auto_update() -> None:
         # TODO: Implement proper month range iteration
         months_to_check = [current_month]
 
-        total_new = 0
-        for month in months_to_check:
-            new_count = process_month(month)
-            total_new += new_count
+        asyncio.run(process_months(months_to_check))
 
 
         # Show final count
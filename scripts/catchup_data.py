@@ -12,20 +12,31 @@ This script:
    - Inserts into the database
 """
 
+import asyncio
+import hashlib
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import dspy  # type: ignore
+import httpx
 import psycopg2
 import typer
 from dotenv import load_dotenv
+from psycopg2.extras import execute_values
 
 from wodrag.agents.extract_metadata import extractor
-from wodrag.data_processing.downloader import download_month
+from wodrag.data_processing.downloader import (
+    HEADERS,
+    download_month_async,
+    generate_months,
+)
 from wodrag.data_processing.extractor import extract_workouts_from_file
+from wodrag.database.client import format_vector, parse_vector
 from wodrag.services.embedding_service import EmbeddingService
 
 # Load environment variables
@@ -55,52 +66,259 @@ def get_last_workout_date() -> datetime:
                 return datetime.now().date() - timedelta(days=1)
 
 
+def get_existing_workout_keys(dates: list[str]) -> set[tuple[str, str]]:
+    """Get the (date, url) keys already stored for any of the given dates."""
+    with get_database_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT date, url FROM workouts WHERE date = ANY(%s::date[])",
+                (dates,),
+            )
+            return {(row[0].isoformat(), row[1]) for row in cur.fetchall()}
+
+
 def get_months_to_process(last_date: datetime, today: datetime) -> list[tuple[int, int]]:
     """Get list of (year, month) tuples that need to be processed."""
-    months = []
-    current = datetime(last_date.year, last_date.month, 1)
-    today_month = datetime(today.year, today.month, 1)
-    
-    while current <= today_month:
-        months.append((current.year, current.month))
-        # Move to next month
-        if current.month == 12:
-            current = datetime(current.year + 1, 1, 1)
-        else:
-            current = datetime(current.year, current.month + 1, 1)
-    
-    return months
+    return list(generate_months(last_date.year, last_date.month, today.year, today.month))
 
 
-def process_month(year: int, month: int, embedding_service: EmbeddingService) -> tuple[int, int]:
-    """Process a single month. Returns (added_count, skipped_count)."""
-    year_month = f"{year}-{month:02d}"
-    logger.info(f"Processing month: {year_month}")
+# Months buffered between pipeline stages before upstream stages wait
+STAGE_QUEUE_SIZE = 4
+# Concurrent DSPy metadata extractions (each one is an LLM round-trip)
+EXTRACT_WORKERS = 12
+# Retries the DSPy LM makes, with exponential backoff, on rate limits and errors
+LM_NUM_RETRIES = 8
+# DSPy's on-disk LM response cache, kept with the data so re-runs reuse it
+DSPY_CACHE_DIR = Path("data/.dspy_cache")
+
+
+async def download_stage(
+    months_to_process: list[tuple[int, int]], html_queue: asyncio.Queue
+) -> float:
+    """Download every month concurrently and hand them to the extract stage in order.
     
-    # 1. Download month data
+    Returns the seconds until the last download finished.
+    """
     output_dir = Path("data/raw")
     output_dir.mkdir(parents=True, exist_ok=True)
+    total_months = len(months_to_process)
+    start = time.perf_counter()
+    last_finished = start
+    
+    def record_finish(_download: asyncio.Task) -> None:
+        nonlocal last_finished
+        last_finished = time.perf_counter()
+    
+    async with httpx.AsyncClient(
+        http2=True,
+        headers=HEADERS,
+        timeout=30,
+        limits=httpx.Limits(max_connections=8),
+    ) as client:
+        downloads = [
+            asyncio.create_task(download_month_async(client, year, month, output_dir))
+            for year, month in months_to_process
+        ]
+        # Handing months on can block behind later stages, so time the
+        # downloads by when they finish rather than when the loop ends
+        for download in downloads:
+            download.add_done_callback(record_finish)
+        
+        for i, ((year, month), download) in enumerate(zip(months_to_process, downloads), 1):
+            year_month = f"{year}-{month:02d}"
+            logger.info(f"Processing month {i}/{total_months}: {year_month}")
+            
+            logger.info(f"📥 Downloading {year_month} workouts...")
+            if not await download:
+                logger.error(f"Failed to download {year_month}")
+                continue
+            
+            await html_queue.put((year_month, output_dir / f"{year_month}.html"))
     
-    html_file = output_dir / f"{year_month}.html"
+    download_time = last_finished - start
+    logger.info(f"📥 Downloaded {total_months} months in {download_time:.1f}s")
+    await html_queue.put(None)
+    return download_time
+
+
+async def extract_stage(html_queue: asyncio.Queue, parsed_queue: asyncio.Queue) -> None:
+    """Extract new workouts and their metadata for each downloaded month."""
+    loop = asyncio.get_running_loop()
+    
+    while (item := await html_queue.get()) is not None:
+        year_month, html_file = item
+        
+        logger.info(f"🔄 Extracting workouts from {year_month} HTML...")
+        workouts = await loop.run_in_executor(None, extract_workouts_from_file, html_file)
+        if not workouts:
+            logger.warning(f"No workouts found in {year_month}")
+            continue
+        
+        logger.info(f"Found {len(workouts)} workouts in {year_month}")
+        prepared, skipped_count = await asyncio.to_thread(prepare_new_workouts, workouts)
+        await parsed_queue.put((year_month, prepared, skipped_count))
+    
+    await parsed_queue.put(None)
+
+
+async def embed_stage(
+    parsed_queue: asyncio.Queue,
+    embedded_queue: asyncio.Queue,
+    embedding_service: EmbeddingService,
+) -> None:
+    """Embed every workout text and summary of a month in batched calls."""
+    while (item := await parsed_queue.get()) is not None:
+        year_month, prepared, skipped_count = item
+        rows = []
+        
+        if prepared:
+            texts = [build_embedding_text(workout_dict) for workout_dict, _, _ in prepared]
+            texts += [summary for _, _, summary in prepared]
+            try:
+                embeddings = await embed_with_cache(embedding_service, texts)
+            except (RuntimeError, ValueError) as e:
+                logger.error(f"Failed to generate embeddings for {year_month}: {e}")
+                prepared = []
+            else:
+                new_count = len(prepared)
+                rows = [
+                    build_workout_row(
+                        workout_dict, metadata, summary, embeddings[i], embeddings[new_count + i]
+                    )
+                    for i, (workout_dict, metadata, summary) in enumerate(prepared)
+                ]
+        
+        await embedded_queue.put((year_month, prepared, rows, skipped_count))
+    
+    await embedded_queue.put(None)
+
+
+async def write_stage(embedded_queue: asyncio.Queue) -> tuple[int, int]:
+    """Insert each month in one multi-row INSERT. Returns (added, skipped)."""
+    total_added = 0
+    total_skipped = 0
+    
+    while (item := await embedded_queue.get()) is not None:
+        year_month, prepared, rows, skipped_count = item
+        
+        inserted = await asyncio.to_thread(insert_workouts, rows) if rows else set()
+        if inserted is None:
+            inserted = set()
+            rows = []
+        for workout_dict, metadata, _ in prepared:
+            if (workout_dict["date"], workout_dict["url"]) in inserted:
+                logger.info(f"✅ Inserted workout for {workout_dict['date']}: {metadata.workout_name}")
+        
+        # Rows the database skipped were stored by another run in the meantime
+        added_count = len(inserted)
+        skipped_count += len(rows) - added_count
+        
+        total_added += added_count
+        total_skipped += skipped_count
+        logger.info(f"Month {year_month}: +{added_count} workouts, {skipped_count} skipped")
+    
+    return total_added, total_skipped
+
+
+def text_sha256(text: str) -> bytes:
+    """Hash a text for the embedding cache."""
+    return hashlib.sha256(text.encode()).digest()
+
+
+# Schema objects the pipeline relies on, and the migration that creates each
+REQUIRED_SCHEMA = {
+    "workouts_date_url_uq": "sql/paradedb/003_unique_workout_date_url.sql",
+    "workout_embedding_cache": "sql/paradedb/002_embedding_cache.sql",
+}
+
+
+def missing_migrations() -> list[str]:
+    """Return the migrations whose index or table is not in the database."""
+    with get_database_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT name FROM unnest(%s::text[]) AS name "
+                "WHERE to_regclass(name) IS NULL",
+                (list(REQUIRED_SCHEMA),),
+            )
+            return [REQUIRED_SCHEMA[name] for (name,) in cur.fetchall()]
+
+
+def get_cached_embeddings(model: str, hashes: list[bytes]) -> dict[bytes, list[float]]:
+    """Look up cached embeddings for the given text hashes in one query."""
+    with get_database_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT text_sha256, embedding::text FROM workout_embedding_cache
+                WHERE model = %s AND text_sha256 = ANY(%s)
+                """,
+                (model, [psycopg2.Binary(h) for h in hashes]),
+            )
+            return {bytes(h): parse_vector(embedding) for h, embedding in cur.fetchall()}
+
+
+def store_cached_embeddings(
+    model: str, entries: list[tuple[bytes, list[float]]]
+) -> None:
+    """Write new (hash, embedding) pairs to the embedding cache."""
+    with get_database_connection() as conn:
+        with conn.cursor() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO workout_embedding_cache (model, text_sha256, embedding)
+                VALUES %s ON CONFLICT DO NOTHING
+                """,
+                [(model, psycopg2.Binary(h), format_vector(e)) for h, e in entries],
+                template="(%s, %s, %s::vector)",
+            )
+        conn.commit()
+
+
+async def embed_with_cache(
+    embedding_service: EmbeddingService, texts: list[str]
+) -> list[list[float]]:
+    """Embed texts, only sending ones missing from the cache to OpenAI.
+
+    Identical texts in the batch are embedded once. Cache failures are
+    logged and fall back to embedding every text.
+    """
+    model = embedding_service.model
+    hashes = [text_sha256(text) for text in texts]
+    unique = dict(zip(hashes, texts))
     
-    logger.info(f"📥 Downloading {year_month} workouts...")
-    success = download_month(year, month, output_dir)
-    if not success:
-        logger.error(f"Failed to download {year_month}")
-        return 0, 0
+    try:
+        cached = await asyncio.to_thread(get_cached_embeddings, model, list(unique))
+    except psycopg2.Error as e:
+        logger.warning(f"Embedding cache lookup failed: {e}")
+        cached = {}
     
-    # 2. Extract workouts from HTML
-    logger.info(f"🔄 Extracting workouts from {year_month} HTML...")
-    workouts = extract_workouts_from_file(html_file)
-    if not workouts:
-        logger.warning(f"No workouts found in {year_month}")
-        return 0, 0
+    misses = [h for h in unique if h not in cached]
+    if misses:
+        new_embeddings = await embedding_service.generate_batch_embeddings_async(
+            [unique[h] for h in misses]
+        )
+        new_entries = [(h, e) for h, e in zip(misses, new_embeddings) if e]
+        cached.update(new_entries)
+        try:
+            await asyncio.to_thread(store_cached_embeddings, model, new_entries)
+        except psycopg2.Error as e:
+            logger.warning(f"Embedding cache write failed: {e}")
     
-    logger.info(f"Found {len(workouts)} workouts in {year_month}")
+    logger.info(f"Embedding cache: {len(unique) - len(misses)} hits, {len(misses)} misses")
+    return [cached.get(h, []) for h in hashes]
+
+
+def prepare_new_workouts(workouts: list) -> tuple[list[tuple], int]:
+    """Drop workouts already stored and extract metadata for the rest.
     
-    # 3. Process each workout
-    added_count = 0
+    Returns (prepared, skipped_count), where prepared holds
+    (workout_dict, metadata, summary) tuples.
+    """
     skipped_count = 0
+    new_workouts = []
+    existing = get_existing_workout_keys([workout.date for workout in workouts])
     
     for workout in workouts:
         workout_dict = asdict(workout)
@@ -110,42 +328,98 @@ def process_month(year: int, month: int, embedding_service: EmbeddingService) ->
             del workout_dict['id']
         
         # Check if workout already exists
-        if workout_exists(workout_dict["date"]):
+        if (workout_dict["date"], workout_dict["url"]) in existing:
             skipped_count += 1
             continue
         
-        if insert_workout_complete(workout_dict, embedding_service):
-            added_count += 1
-        else:
-            logger.error(f"Failed to insert workout for {workout_dict['date']}")
+        new_workouts.append(workout_dict)
+    
+    # Re-posted benchmarks share their text; extract each distinct text once
+    unique_workouts = {}
+    for workout_dict in new_workouts:
+        unique_workouts.setdefault(workout_dict["workout"], workout_dict)
     
-    return added_count, skipped_count
+    # Extract metadata concurrently; DSPy is sync-only, so use threads
+    with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as executor:
+        metadatas = dict(zip(
+            unique_workouts, executor.map(extract_metadata, unique_workouts.values())
+        ))
+    
+    prepared = [
+        (workout_dict, metadata, build_summary(metadata))
+        for workout_dict in new_workouts
+        if (metadata := metadatas[workout_dict["workout"]]) is not None
+    ]
+    
+    return prepared, skipped_count
 
 
-def insert_workout_complete(workout_data: dict, embedding_service: EmbeddingService) -> bool:
-    """Insert a workout with complete metadata and embeddings."""
+def extract_metadata(workout_dict: dict):
+    """Extract metadata for one workout, or None if extraction fails."""
     try:
-        # Extract metadata using AI
-        metadata = extractor(workout=workout_data["workout"])
-        
-        # Generate summary
-        movements_str = ", ".join(metadata.movements[:3]) if metadata.movements else "various movements"
-        workout_type = metadata.workout_type or "CrossFit"
-        
-        if metadata.workout_name and metadata.workout_name != "Untitled":
-            summary = f"{metadata.workout_name}: A {workout_type} workout involving {movements_str}"
-        else:
-            summary = f"A {workout_type} workout involving {movements_str}"
-        
-        # Generate embeddings
-        workout_text = workout_data["workout"]
-        if workout_data.get("scaling"):
-            workout_text += f"\n{workout_data['scaling']}"
-        
-        workout_embedding = embedding_service.generate_embedding(workout_text)
-        summary_embedding = embedding_service.generate_embedding(summary)
+        return extractor(workout=workout_dict["workout"])
+    except Exception as e:
+        logger.error(f"Failed to extract metadata for {workout_dict['date']}: {e}")
+        return None
+
 
-        # Insert into database
+def build_summary(metadata) -> str:
+    """Build the one-sentence summary for a workout from its metadata."""
+    movements_str = ", ".join(metadata.movements[:3]) if metadata.movements else "various movements"
+    workout_type = metadata.workout_type or "CrossFit"
+    
+    if metadata.workout_name and metadata.workout_name != "Untitled":
+        return f"{metadata.workout_name}: A {workout_type} workout involving {movements_str}"
+    return f"A {workout_type} workout involving {movements_str}"
+
+
+def build_embedding_text(workout_data: dict) -> str:
+    """Build the text embedded for a workout (workout plus scaling)."""
+    workout_text = workout_data["workout"]
+    if workout_data.get("scaling"):
+        workout_text += f"\n{workout_data['scaling']}"
+    return workout_text
+
+
+def build_workout_row(
+    workout_data: dict,
+    metadata,
+    summary: str,
+    workout_embedding: list[float],
+    summary_embedding: list[float],
+) -> tuple:
+    """Build the INSERT row for a workout with complete metadata and embeddings.
+    
+    A text with no embedding (empty, or failed in the API) is stored as NULL,
+    which the embedding backfill picks up later; pgvector rejects ``[]``.
+    """
+    return (
+        workout_data["date"],
+        workout_data.get("url", ""),
+        workout_data["raw_text"],
+        workout_data["workout"],
+        workout_data.get("scaling"),
+        workout_data.get("has_video", False),
+        workout_data.get("has_article", False),
+        workout_data.get("month_file", ""),
+        metadata.movements,
+        metadata.equipment,
+        metadata.workout_type,
+        metadata.workout_name,
+        summary,
+        format_vector(workout_embedding) if workout_embedding else None,
+        format_vector(summary_embedding) if summary_embedding else None,
+    )
+
+
+def insert_workouts(rows: list[tuple]) -> set[tuple[str, str]] | None:
+    """Insert workout rows in one statement and commit.
+    
+    Rows whose (date, url) is already stored are skipped by the database, so
+    re-running a month is safe. Returns the (date, url) keys actually
+    inserted, or None if the insert failed.
+    """
+    try:
         with get_database_connection() as conn:
             with conn.cursor() as cur:
                 sql = """
@@ -154,37 +428,45 @@ def insert_workout_complete(workout_data: dict, embedding_service: EmbeddingServ
                         has_video, has_article, month_file,
                         movements, equipment, workout_type, workout_name,
                         one_sentence_summary, workout_embedding, summary_embedding
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
+                    ) VALUES %s
+                    ON CONFLICT (date, url) DO NOTHING
+                    RETURNING date, url
                 """
-                cur.execute(sql, (
-                    workout_data["date"],
-                    workout_data.get("url", ""),
-                    workout_data["raw_text"],
-                    workout_data["workout"],
-                    workout_data.get("scaling"),
-                    workout_data.get("has_video", False),
-                    workout_data.get("has_article", False),
-                    workout_data.get("month_file", ""),
-                    metadata.movements,
-                    metadata.equipment,
-                    metadata.workout_type,
-                    metadata.workout_name,
-                    summary,
-                    workout_embedding,
-                    summary_embedding,
-                ))
+                inserted = execute_values(cur, sql, rows, page_size=200, fetch=True)
                 conn.commit()
-
-        logger.info(f"✅ Inserted workout for {workout_data['date']}: {metadata.workout_name}")
-        return True
+        return {(row[0].isoformat(), row[1]) for row in inserted}
 
     except Exception as e:
-        logger.error(f"Failed to insert workout for {workout_data['date']}: {e}")
-        return False
+        logger.error(f"Failed to insert {len(rows)} workouts: {e}")
+        return None
 
 
+async def process_months(
+    months_to_process: list[tuple[int, int]], embedding_service: EmbeddingService
+) -> tuple[int, int]:
+    """Process months through a download → extract → embed → insert pipeline.
+    
+    Each stage works on a different month at the same time, connected by
+    bounded queues so a slow stage applies backpressure upstream.
+    Returns (total_added, total_skipped).
+    """
+    html_queue: asyncio.Queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    parsed_queue: asyncio.Queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    embedded_queue: asyncio.Queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    
+    start = time.perf_counter()
+    async with asyncio.TaskGroup() as tg:
+        downloader = tg.create_task(download_stage(months_to_process, html_queue))
+        tg.create_task(extract_stage(html_queue, parsed_queue))
+        tg.create_task(embed_stage(parsed_queue, embedded_queue, embedding_service))
+        writer = tg.create_task(write_stage(embedded_queue))
+    
+    pipeline_time = time.perf_counter() - start
+    logger.info(
+        f"Pipeline finished in {pipeline_time:.1f}s "
+        f"({pipeline_time - downloader.result():.1f}s of processing after downloads)"
+    )
+    return writer.result()
 
 
 def main(
@@ -202,7 +484,10 @@ def main(
     # Configure DSPy for metadata extraction
     openai_api_key = os.getenv("OPENAI_API_KEY")
     if openai_api_key:
-        dspy.configure(lm=dspy.LM("openai/gpt-4o-mini", api_key=openai_api_key))
+        dspy.configure_cache(disk_cache_dir=str(DSPY_CACHE_DIR))
+        dspy.configure(lm=dspy.LM(
+            "openai/gpt-4o-mini", api_key=openai_api_key, num_retries=LM_NUM_RETRIES
+        ))
     
     # Initialize services
     embedding_service = EmbeddingService()
@@ -238,18 +523,14 @@ def main(
             logger.info(f"  - {year}-{month:02d}")
         return
     
-    # Process each month
-    total_added = 0
-    total_skipped = 0
+    if missing := missing_migrations():
+        logger.error(f"Apply these migrations before catching up: {', '.join(missing)}")
+        raise typer.Exit(1)
     
-    for i, (year, month) in enumerate(months_to_process, 1):
-        logger.info(f"Processing month {i}/{total_months}: {year}-{month:02d}")
-        
-        added, skipped = process_month(year, month, embedding_service)
-        total_added += added
-        total_skipped += skipped
-        
-        logger.info(f"Month {year}-{month:02d}: +{added} workouts, {skipped} skipped")
+    # Process each month
+    total_added, total_skipped = asyncio.run(
+        process_months(months_to_process, embedding_service)
+    )
     
     # Final report
     logger.info(f"\n{'='*50}")
@@ -36,36 +36,39 @@ def main() -> None:
         print(f"   Summary: {row['one_sentence_summary'][:80]}...")
         print()
     
-    # Get unique movements
-    print("📊 Most common movements:")
+    # Count movements and equipment in one pass over the workouts table
     query = """
-    SELECT unnest(movements) as movement, COUNT(*) as count
-    FROM pg_db.workouts 
-    WHERE movements IS NOT NULL
-    GROUP BY unnest(movements)
-    ORDER BY count DESC
-    LIMIT 15
+    WITH w AS MATERIALIZED (
+        SELECT movements, equipment FROM pg_db.workouts
+    ),
+    counts AS (
+        SELECT kind, value, COUNT(*) as count
+        FROM (
+            SELECT 'movement' as kind, unnest(movements) as value
+            FROM w WHERE movements IS NOT NULL
+            UNION ALL
+            SELECT 'equipment' as kind, unnest(equipment) as value
+            FROM w WHERE equipment IS NOT NULL
+        )
+        GROUP BY kind, value
+    )
+    SELECT kind, value, count
+    FROM counts
+    QUALIFY row_number() OVER (PARTITION BY kind ORDER BY count DESC) <= 15
+    ORDER BY kind, count DESC
     """
-    movements = service.execute_query(query)
+    counts = service.execute_query(query)
+    movements = [row for row in counts if row['kind'] == 'movement']
+    equipment = [row for row in counts if row['kind'] == 'equipment']
     
+    print("📊 Most common movements:")
     for mov in movements:
-        print(f"  - {mov['movement']}: {mov['count']} workouts")
+        print(f"  - {mov['value']}: {mov['count']} workouts")
     
     print()
     print("🔧 Most common equipment:")
-    query = """
-    SELECT unnest(equipment) as equip, COUNT(*) as count
-    FROM pg_db.workouts 
-    WHERE equipment IS NOT NULL
-    GROUP BY unnest(equipment)
-    ORDER BY count DESC
-    LIMIT 15
-    """
-    equipment = service.execute_query(query)
-    
     for eq in equipment:
-        print(f"  - {eq['equip']}: {eq['count']} workouts")
-
+        print(f"  - {eq['value']}: {eq['count']} workouts")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
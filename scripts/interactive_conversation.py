@@ -13,6 +13,8 @@ class InteractiveConversationTester:
         self.base_url = base_url
         self.conversation_id: str | None = None
         self.message_count = 0
+        # Keeps the connection to the API open between messages
+        self.session = requests.Session()
 
     def query_agent(self, question: str, verbose: bool = False) -> dict:
         """Send a query to the agent."""
@@ -26,7 +28,7 @@ class InteractiveConversationTester:
             payload["conversation_id"] = self.conversation_id
 
         try:
-            response = requests.post(url, json=payload, timeout=30)
+            response = self.session.post(url, json=payload, timeout=30)
             response.raise_for_status()
 
             data = response.json()
@@ -179,7 +181,10 @@ def main():
 
     # Create and run the tester
     tester = InteractiveConversationTester(base_url)
-    tester.run()
+    try:
+        tester.run()
+    finally:
+        tester.session.close()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 
 import dspy
 
@@ -19,10 +20,25 @@ class ExtractMovements(dspy.Signature):
 
 extractor = dspy.ChainOfThought(ExtractMovements)
 
+# Workouts per prompt; small prompts stay well inside the model's limits and
+# let the chunks be extracted concurrently
+WORKOUTS_PER_CHUNK = 20
+MAX_CONCURRENT_REQUESTS = 8
+
+
+def extract_movements(text: str) -> list[str]:
+    """Extract the movements from one chunk of workout text."""
+    return extractor(text=text).movements
+
 
 if __name__ == "__main__":
     dspy.configure(lm=dspy.LM("openrouter/google/gemini-2.5-flash", max_tokens=100000))
-    text = sample_workouts().join("\n\n")
-    extracted = extractor(text=text)
-    for _movement in sorted(extracted.movements):
+    workouts = sample_workouts()
+    chunks = [
+        "\n\n".join(workouts[i : i + WORKOUTS_PER_CHUNK])
+        for i in range(0, len(workouts), WORKOUTS_PER_CHUNK)
+    ]
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        movements = set().union(*executor.map(extract_movements, chunks))
+    for _movement in sorted(movements):
         pass
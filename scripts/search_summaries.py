@@ -3,6 +3,8 @@
 
 import os
 import sys
+from functools import cache
+from pathlib import Path
 
 import typer
 from dotenv import load_dotenv
@@ -11,20 +13,39 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 # PostgreSQL-only, no Supabase needed
+from wodrag.database.client import get_pooled_connection
 from wodrag.database.models import WorkoutFilter
 from wodrag.database.workout_repository import WorkoutRepository
 from wodrag.services.embedding_service import EmbeddingService
+from wodrag.utils import is_exact_lexical_query, quoted_phrase
 
 # Load environment variables
 load_dotenv()
 
+# Hybrid search weight; scripts/tune_semantic_weight.py computes one from
+# labeled queries
+SEMANTIC_WEIGHT = float(os.getenv("HYBRID_SEMANTIC_WEIGHT", "0.7"))
+
 app = typer.Typer()
 
 
+@cache
+def get_repository() -> WorkoutRepository:
+    """Build the repository once, so every query in a run shares its pooled
+    connections and its lazily created embedding client."""
+    return WorkoutRepository(connection_factory=get_pooled_connection)
+
+
 @app.command()
 def search(
-    query: str = typer.Argument(
-        ..., help='Search query (use quotes for phrases: "pogo stick")'
+    query: str | None = typer.Argument(
+        None, help='Search query (use quotes for phrases: "pogo stick")'
+    ),
+    queries_file: str | None = typer.Option(
+        None,
+        "--file",
+        "-f",
+        help="Run every query in this file (one per line) in a single process",
     ),
     limit: int = typer.Option(10, "--limit", "-l", help="Maximum number of results"),
     threshold: float = typer.Option(
@@ -43,7 +64,10 @@ def search(
         False, "--hybrid", "-h", help="Use hybrid search (semantic + keyword)"
     ),
     semantic_weight: float = typer.Option(
-        0.7, "--weight", "-w", help="Semantic weight for hybrid search (0-1)"
+        SEMANTIC_WEIGHT,
+        "--weight",
+        "-w",
+        help="Semantic weight for hybrid search (0-1, default HYBRID_SEMANTIC_WEIGHT)",
     ),
 ) -> None:
     """
@@ -54,11 +78,29 @@ def search(
     - word1 OR word2 - match either term
     - word1 -word2 - exclude word2
     - word1 word2 - match both terms
+
+    Without --hybrid, a query that is only a quoted phrase or a single
+    capitalized name (such as Fran) uses keyword search alone and skips the
+    embedding call; a quoted phrase must match exactly.
+
+    Prefer --file over calling this command in a shell loop: each process
+    pays for its own connections and embedding client.
     """
 
     try:
         # Initialize services
-        repository = WorkoutRepository()
+        repository = get_repository()
+
+        if queries_file:
+            queries = [
+                line.strip()
+                for line in Path(queries_file).read_text().splitlines()
+                if line.strip()
+            ]
+        elif query:
+            queries = [query]
+        else:
+            sys.exit(1)
 
         # Build filters
         filters = WorkoutFilter()
@@ -69,37 +111,37 @@ def search(
         if workout_type:
             filters.workout_type = workout_type
 
-        # Perform search
-        if hybrid:
-            pass
-        if filters.movements or filters.equipment or filters.workout_type:
-            pass
-        if not hybrid:
-            pass
-
-        if hybrid:
-            results = repository.hybrid_search(
-                query_text=query,
-                semantic_weight=semantic_weight,
-                limit=limit,
-            )
-        else:
-            results = repository.search_summaries(
-                query_text=query,
-                limit=limit,
-            )
-
-        if not results:
-            return
-
+        for query_text in queries:
+            phrase = quoted_phrase(query_text)
+            if hybrid:
+                results = repository.hybrid_search(
+                    query_text=query_text,
+                    semantic_weight=semantic_weight,
+                    limit=limit,
+                    filters=filters,
+                )
+            elif is_exact_lexical_query(query_text):
+                results = repository.text_search_workouts(
+                    phrase or query_text,
+                    limit=limit,
+                    filters=filters,
+                    phrase=phrase is not None,
+                )
+            else:
+                # Stream rows so the first result shows before the query ends
+                results = repository.iter_search_summaries(
+                    query_text=query_text,
+                    limit=limit,
+                    filters=filters,
+                )
 
-        for _i, result in enumerate(results, 1):
-            workout = result.workout
+            for _i, result in enumerate(results, 1):
+                workout = result.workout
 
-            if workout.movements:
-                pass
-            if workout.equipment:
-                pass
+                if workout.movements:
+                    pass
+                if workout.equipment:
+                    pass
 
     except Exception:
         sys.exit(1)
@@ -111,7 +153,7 @@ def test_vector_search() -> None:
 
     try:
         # Initialize services
-        repository = WorkoutRepository()
+        repository = get_repository()
         embedding_service = EmbeddingService()
 
         # Sample test queries
@@ -123,13 +165,12 @@ def test_vector_search() -> None:
         ]
 
 
-        for query in test_queries:
-
-            # Generate embedding
-            query_embedding = embedding_service.generate_embedding(query)
+        # One embeddings request covers every test query
+        query_embeddings = embedding_service.generate_batch_embeddings(test_queries)
 
+        for query_embedding in query_embeddings:
             # Perform search
-            results = repository.hybrid_search(
+            results = repository.vector_search(
                 query_embedding=query_embedding, limit=3, similarity_threshold=0.6
             )
 
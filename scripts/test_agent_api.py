@@ -2,6 +2,8 @@
 """Test script for the master agent API."""
 
 import json
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 import dspy
 
@@ -10,6 +12,10 @@ dspy.configure(lm=dspy.LM("openrouter/google/gemini-2.5-flash-lite", max_tokens=
 
 API_BASE = "http://localhost:8000/api/v1"
 
+# Shared by every request so they reuse keep-alive connections
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+
 def test_agent_queries():
     """Test various queries against the master agent API."""
     
@@ -35,18 +41,21 @@ def test_agent_queries():
     print("Testing Master Agent API")
     print("=" * 50)
     
-    for i, query in enumerate(queries, 1):
+    def send(query: dict) -> requests.Response:
+        return SESSION.post(f"{API_BASE}/agent/query", json=query, timeout=30)
+
+    # The queries are independent, so send them all at once and print the
+    # results in order once they are back
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = [executor.submit(send, query) for query in queries]
+
+    for i, (query, future) in enumerate(zip(queries, futures), 1):
         print(f"\n{i}. Question: {query['question']}")
         print(f"   Verbose: {query['verbose']}")
         print("-" * 50)
         
         try:
-            response = requests.post(
-                f"{API_BASE}/agent/query",
-                json=query,
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
+            response = future.result()
             
             if response.status_code == 200:
                 data = response.json()
@@ -72,7 +81,7 @@ def test_health():
     
     # Basic health check
     try:
-        response = requests.get(f"{API_BASE}/health/")
+        response = SESSION.get(f"{API_BASE}/health/")
         if response.status_code == 200:
             print("✅ Basic health check: OK")
         else:
@@ -86,8 +95,11 @@ if __name__ == "__main__":
     print("Make sure to run: uv run python scripts/run_api.py")
     print("=" * 60)
     
-    test_health()
-    test_agent_queries()
+    try:
+        test_health()
+        test_agent_queries()
+    finally:
+        SESSION.close()
     
     print("\nTest completed!")
     print("\nExample API usage:")
@@ -4,6 +4,7 @@
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 
@@ -13,6 +14,9 @@ class ConversationTester:
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
         self.conversation_id: Optional[str] = None
+        # Reuse one keep-alive connection for every query
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
     
     def query_agent(self, question: str, verbose: bool = False) -> dict:
         """Send a query to the agent."""
@@ -25,7 +29,7 @@ class ConversationTester:
         if self.conversation_id:
             payload["conversation_id"] = self.conversation_id
         
-        response = requests.post(url, json=payload)
+        response = self.session.post(url, json=payload)
         response.raise_for_status()
         
         data = response.json()
@@ -92,6 +96,13 @@ def test_conversation_flow():
         print("   uv run python scripts/run_api.py")
     except Exception as e:
         print(f"❌ Test failed: {e}")
+    finally:
+        tester.session.close()
+
+
+def ask_in_order(tester: ConversationTester, questions: list[str]) -> list[dict]:
+    """Ask questions one after another in the tester's conversation."""
+    return [tester.query_agent(question) for question in questions]
 
 
 def test_multiple_conversations():
@@ -99,41 +110,52 @@ def test_multiple_conversations():
     print("\nTesting Multiple Conversations")
     print("=" * 80)
     
+    tester1 = ConversationTester()
+    tester2 = ConversationTester()
     try:
-        # Conversation 1
-        tester1 = ConversationTester()
+        # Each conversation stays sequential, since follow-ups need context,
+        # but the two conversations are independent and run side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future1 = executor.submit(
+                ask_in_order,
+                tester1,
+                ["What is Fran?", "How long does it typically take?"],
+            )
+            future2 = executor.submit(
+                ask_in_order,
+                tester2,
+                ["What is Murph?", "What equipment is needed?"],
+            )
+        start1, follow_up1 = future1.result()
+        start2, follow_up2 = future2.result()
+
         print("Conversation 1 - About Fran")
-        response = tester1.query_agent("What is Fran?")
-        tester1.print_response(response)
-        conv1_id = response["data"]["conversation_id"]
+        tester1.print_response(start1)
+        conv1_id = start1["data"]["conversation_id"]
         
-        # Conversation 2
-        tester2 = ConversationTester()
         print("Conversation 2 - About Murph")
-        response = tester2.query_agent("What is Murph?")
-        tester2.print_response(response)
-        conv2_id = response["data"]["conversation_id"]
+        tester2.print_response(start2)
+        conv2_id = start2["data"]["conversation_id"]
         
         # Verify different conversation IDs
         assert conv1_id != conv2_id
         print(f"✅ Conversations have different IDs: {conv1_id[:8]}... vs {conv2_id[:8]}...")
         
-        # Continue conversation 1
         print("Continuing Conversation 1")
-        response = tester1.query_agent("How long does it typically take?")
-        tester1.print_response(response)
-        assert response["data"]["conversation_id"] == conv1_id
+        tester1.print_response(follow_up1)
+        assert follow_up1["data"]["conversation_id"] == conv1_id
         
-        # Continue conversation 2
         print("Continuing Conversation 2")
-        response = tester2.query_agent("What equipment is needed?")
-        tester2.print_response(response)
-        assert response["data"]["conversation_id"] == conv2_id
+        tester2.print_response(follow_up2)
+        assert follow_up2["data"]["conversation_id"] == conv2_id
         
         print("✅ Multiple conversations test passed!")
         
     except Exception as e:
         print(f"❌ Multiple conversations test failed: {e}")
+    finally:
+        tester1.session.close()
+        tester2.session.close()
 
 
 def test_conversation_context():
@@ -141,9 +163,8 @@ def test_conversation_context():
     print("\nTesting Conversation Context")
     print("=" * 80)
     
+    tester = ConversationTester()
     try:
-        tester = ConversationTester()
-        
         # Establish context about a specific workout
         print("Setting up context...")
         response = tester.query_agent("I want to do a workout with burpees and pull-ups")
@@ -163,6 +184,8 @@ def test_conversation_context():
         
     except Exception as e:
         print(f"❌ Context reference test failed: {e}")
+    finally:
+        tester.session.close()
 
 
 if __name__ == "__main__":
@@ -14,39 +14,56 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from wodrag.agents.text_to_sql import QueryGenerator
 
+# Shared with the other scripts' LLM caches; re-running the same test queries
+# reuses the generated SQL instead of calling the model again
+DSPY_CACHE_DIR = Path("data/.dspy_cache")
 
-def print_records(results: list[dict[str, Any]], max_records: int = 5, max_width: int = 80) -> None:
-    """Print results as formatted records with truncation."""
+
+def format_value(value: Any, max_width: int) -> str:
+    """Format one field for display, truncating long values."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, list):
+        # Handle arrays nicely
+        items = ", ".join(map(str, value[:10]))
+        if len(value) > 10:
+            return f"[{items}, ... and {len(value)-10} more]"
+        return f"[{items}]"
+    value_str = str(value)
+    if len(value_str) > max_width:
+        return value_str[:max_width-3] + "..."
+    return value_str
+
+
+def print_records(
+    results: list[dict[str, Any]],
+    max_records: int = 5,
+    max_width: int = 80,
+    total_rows: int | None = None,
+) -> None:
+    """Print results as formatted records with truncation.
+
+    Pass total_rows when results holds only the first rows of a larger result.
+    """
     if not results:
         print("  📭 No results found")
         return
     
-    display_results = results[:max_records]
-    
-    for i, record in enumerate(display_results, 1):
-        print(f"  📄 Record {i}:")
-        
-        for key, value in record.items():
-            if value is None:
-                value_str = "NULL"
-            elif isinstance(value, list):
-                # Handle arrays nicely
-                items = [str(item) for item in value[:10]]
-                value_str = f"[{', '.join(items)}]"
-                if len(value) > 10:
-                    value_str = value_str[:-1] + f", ... and {len(value)-10} more]"
-            else:
-                value_str = str(value)
-                if len(value_str) > max_width:
-                    value_str = value_str[:max_width-3] + "..."
-            
-            print(f"    {key}: {value_str}")
-        
-        print()
+    # Build the whole listing and write it once rather than a print per field
+    lines = []
+    for i, record in enumerate(results[:max_records], 1):
+        lines.append(f"  📄 Record {i}:")
+        lines.extend(
+            f"    {key}: {format_value(value, max_width)}"
+            for key, value in record.items()
+        )
+        lines.append("")
     
-    if len(results) > max_records:
-        print(f"  ... and {len(results) - max_records} more records")
-    print()
+    total = len(results) if total_rows is None else total_rows
+    if total > max_records:
+        lines.append(f"  ... and {total - max_records} more records")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main() -> None:
@@ -63,7 +80,11 @@ def main() -> None:
         print("❌ OPENAI_API_KEY not found in environment")
         sys.exit(1)
     
-    dspy.configure(lm=dspy.LM("openai/gpt-4o-mini", api_key=openai_key))
+    # Deterministic generation so cached SQL matches what the model would return
+    dspy.configure_cache(disk_cache_dir=str(DSPY_CACHE_DIR))
+    dspy.configure(
+        lm=dspy.LM("openai/gpt-4o-mini", api_key=openai_key, temperature=0.0)
+    )
     
     try:
         generator = QueryGenerator()
@@ -80,11 +101,13 @@ def main() -> None:
                 print(f"Generated SQL: {sql_query}")
                 print()
                 
-                results = generator.duckdb_service.execute_query(sql_query)
-                print(f"✅ Found {len(results)} results:")
+                results, total = generator.duckdb_service.execute_query_head(
+                    sql_query, args.limit
+                )
+                print(f"✅ Found {total} results:")
                 print()
                 
-                print_records(results, max_records=args.limit)
+                print_records(results, max_records=args.limit, total_rows=total)
                     
             except Exception as e:
                 print(f"❌ Error: {e}")
@@ -116,11 +139,13 @@ def main() -> None:
                     print(f"Generated SQL: {sql_query}")
                     print()
                     
-                    results = generator.duckdb_service.execute_query(sql_query)
-                    print(f"✅ Found {len(results)} results:")
+                    results, total = generator.duckdb_service.execute_query_head(
+                        sql_query, 3
+                    )
+                    print(f"✅ Found {total} results:")
                     print()
                     
-                    print_records(results, max_records=3)
+                    print_records(results, max_records=3, total_rows=total)
                         
                 except Exception as e:
                     print(f"❌ Error: {e}")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Pick the hybrid search semantic weight from labeled queries.
+
+Each line of the labels file is a query, a tab, and the comma-separated ids
+of the workouts that answer it. The script measures the mean reciprocal rank
+(MRR) of pure semantic search and pure BM25 search over those queries and
+weights each by its share: alpha = semantic_mrr / (semantic_mrr + bm25_mrr).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import typer
+from dotenv import load_dotenv
+
+# Add the parent directory to Python path to import wodrag modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from wodrag.database.client import get_pooled_connection
+from wodrag.database.models import SearchResult
+from wodrag.database.workout_repository import WorkoutRepository
+
+load_dotenv()
+
+app = typer.Typer()
+
+
+def load_labels(labels_file: str) -> list[tuple[str, set[int]]]:
+    """Read (query, relevant workout ids) pairs from a tab-separated file."""
+    labels = []
+    for line in Path(labels_file).read_text().splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        query, ids = line.split("\t", 1)
+        labels.append((query.strip(), {int(i) for i in ids.split(",") if i.strip()}))
+    return labels
+
+
+def reciprocal_rank(results: list[SearchResult], relevant: set[int]) -> float:
+    """Return 1/rank of the first relevant result, or 0 if none is found."""
+    for rank, result in enumerate(results, 1):
+        if result.workout.id in relevant:
+            return 1 / rank
+    return 0.0
+
+
+@app.command()
+def tune(
+    labels_file: str = typer.Argument(
+        ..., help="Tab-separated file: query<TAB>relevant ids (comma-separated)"
+    ),
+    limit: int = typer.Option(10, "--limit", "-l", help="Results scored per query"),
+) -> None:
+    """Print the HYBRID_SEMANTIC_WEIGHT setting for the labeled queries."""
+    labels = load_labels(labels_file)
+    if not labels:
+        typer.echo("No labeled queries found", err=True)
+        raise typer.Exit(1)
+
+    repository = WorkoutRepository(connection_factory=get_pooled_connection)
+    semantic_total = 0.0
+    bm25_total = 0.0
+    for query, relevant in labels:
+        semantic_total += reciprocal_rank(
+            repository.search_summaries(query, limit=limit), relevant
+        )
+        bm25_total += reciprocal_rank(
+            repository.text_search_workouts(query, limit=limit), relevant
+        )
+
+    semantic_mrr = semantic_total / len(labels)
+    bm25_mrr = bm25_total / len(labels)
+    typer.echo(f"Semantic MRR@{limit}: {semantic_mrr:.3f}")
+    typer.echo(f"BM25 MRR@{limit}: {bm25_mrr:.3f}")
+    if semantic_mrr + bm25_mrr == 0:
+        typer.echo("Neither search found a relevant workout", err=True)
+        raise typer.Exit(1)
+
+    alpha = semantic_mrr / (semantic_mrr + bm25_mrr)
+    typer.echo("Add to .env:")
+    typer.echo(f"HYBRID_SEMANTIC_WEIGHT={alpha:.2f}")
+
+
+if __name__ == "__main__":
+    app()
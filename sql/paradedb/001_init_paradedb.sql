@@ -39,13 +39,17 @@ CREATE TABLE workouts (
 CREATE INDEX idx_workouts_date ON workouts(date);
 CREATE INDEX idx_workouts_month_file ON workouts(month_file);
 CREATE INDEX idx_workouts_type ON workouts(workout_type);
+CREATE UNIQUE INDEX workouts_date_url_uq ON workouts(date, url);
+CREATE INDEX idx_workouts_movements ON workouts USING gin(movements);
+CREATE INDEX idx_workouts_equipment ON workouts USING gin(equipment);
 
 -- 4. Create vector similarity indexes
 CREATE INDEX idx_workouts_embedding ON workouts 
-USING ivfflat (workout_embedding vector_cosine_ops) WITH (lists = 100);
+USING ivfflat (workout_embedding vector_ip_ops) WITH (lists = 100);
 
-CREATE INDEX idx_workouts_summary_embedding ON workouts 
-USING ivfflat (summary_embedding vector_cosine_ops) WITH (lists = 100);
+CREATE INDEX workouts_summary_embedding_half_hnsw ON workouts
+USING hnsw ((summary_embedding::halfvec(1536)) halfvec_ip_ops)
+WITH (m = 16, ef_construction = 64);
 
 -- 5. Create ParadeDB BM25 index for full-text search
 -- This replaces PostgreSQL's tsvector with ParadeDB's superior BM25 ranking
@@ -0,0 +1,13 @@
+-- Embedding cache for the catch-up pipeline
+-- Stores each embedded text by SHA-256 so re-runs and repeated boilerplate
+-- (shared scaling text, identical summaries) skip the OpenAI call
+
+CREATE TABLE IF NOT EXISTS workout_embedding_cache (
+    model TEXT NOT NULL,
+    text_sha256 BYTEA NOT NULL,
+    embedding vector(1536) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    -- Keyed by model so switching embedding models never returns stale vectors
+    PRIMARY KEY (model, text_sha256)
+);
@@ -0,0 +1,5 @@
+-- Unique (date, url) key for workouts
+-- Lets loaders insert with ON CONFLICT (date, url) DO NOTHING, so re-running
+-- a month is idempotent. Remove any duplicate rows before applying.
+
+CREATE UNIQUE INDEX IF NOT EXISTS workouts_date_url_uq ON workouts (date, url);
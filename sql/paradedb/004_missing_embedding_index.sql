@@ -0,0 +1,6 @@
+-- Partial index over workouts still missing a workout embedding
+-- Lets the embedding backfill page through (and count) the remaining rows
+-- with an index scan instead of scanning the whole table
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS workouts_missing_embedding
+ON workouts (id) WHERE workout_embedding IS NULL;
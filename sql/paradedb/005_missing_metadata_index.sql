@@ -0,0 +1,6 @@
+-- Partial index over workouts still missing metadata
+-- Matches the metadata extractor's filter (one_sentence_summary IS NULL) and
+-- its (date, id) keyset order, so each batch is an index range scan
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS workouts_need_metadata
+ON workouts (date, id) WHERE one_sentence_summary IS NULL;
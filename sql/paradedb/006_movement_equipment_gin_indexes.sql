@@ -0,0 +1,9 @@
+-- GIN indexes on the movement and equipment arrays
+-- Search filters match these columns with array overlap (&&), which a GIN
+-- index answers directly instead of testing every row
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_workouts_movements
+ON workouts USING gin (movements);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_workouts_equipment
+ON workouts USING gin (equipment);
@@ -0,0 +1,9 @@
+-- Rebuild the workout embedding index for inner product search
+-- OpenAI embeddings are unit length, so searches rank by negative inner
+-- product (<#>), which matches cosine order without computing norms. An
+-- index only serves the operator class it was built with. The summary
+-- embedding index is replaced in 008.
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_workouts_embedding;
+CREATE INDEX CONCURRENTLY idx_workouts_embedding ON workouts
+USING ivfflat (workout_embedding vector_ip_ops) WITH (lists = 100);
@@ -0,0 +1,13 @@
+-- Rescale any stored embedding that is not unit length
+-- Inner-product search (<#>) only ranks like cosine similarity over unit
+-- vectors. OpenAI embeddings already are, so this normally touches no rows;
+-- it guards against vectors imported from other sources. Safe to re-run.
+-- Requires pgvector 0.7+ for l2_normalize.
+
+UPDATE workouts
+SET summary_embedding = l2_normalize(summary_embedding)
+WHERE abs(vector_norm(summary_embedding) - 1) > 1e-3;
+
+UPDATE workouts
+SET workout_embedding = l2_normalize(workout_embedding)
+WHERE abs(vector_norm(workout_embedding) - 1) > 1e-3;
@@ -1,9 +1,18 @@
 """Tests for the downloader module."""
 
 from pathlib import Path
+from typing import Any
 from unittest.mock import Mock, patch
 
-from wodrag.data_processing.downloader import download_month, generate_months
+import httpx
+import pytest
+
+from wodrag.data_processing.downloader import (
+    download_month,
+    download_month_async,
+    download_months,
+    generate_months,
+)
 
 
 class TestGenerateMonths:
@@ -85,3 +94,77 @@ class TestDownloadMonth:
         # Check results
         assert result is False
         assert not (tmp_path / "2021-03.html").exists()
+
+
+def mock_transport(statuses: dict[str, int]) -> httpx.MockTransport:
+    """Serve each URL path with the given status and a small HTML body."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses.get(request.url.path, 404)
+        return httpx.Response(status, text=f"<html>{request.url.path}</html>")
+
+    return httpx.MockTransport(handler)
+
+
+class TestDownloadMonthAsync:
+    """Test the download_month_async function."""
+
+    @pytest.mark.asyncio
+    async def test_successful_download(self, tmp_path: Path) -> None:
+        """Test a month is saved using the shared client."""
+        transport = mock_transport({"/workout/2021/03": 200})
+        async with httpx.AsyncClient(transport=transport) as client:
+            result = await download_month_async(client, 2021, 3, tmp_path)
+
+        assert result is True
+        assert (tmp_path / "2021-03.html").read_text() == (
+            "<html>/workout/2021/03</html>"
+        )
+
+    @pytest.mark.asyncio
+    async def test_download_failure(self, tmp_path: Path) -> None:
+        """Test an HTTP error status is reported as a failure."""
+        transport = mock_transport({"/workout/2021/03": 500})
+        async with httpx.AsyncClient(transport=transport) as client:
+            result = await download_month_async(client, 2021, 3, tmp_path)
+
+        assert result is False
+        assert not (tmp_path / "2021-03.html").exists()
+
+    @pytest.mark.asyncio
+    async def test_skip_existing_file(self, tmp_path: Path) -> None:
+        """Test that existing files are not requested again."""
+        existing_file = tmp_path / "2021-03.html"
+        existing_file.write_text("Existing content")
+        transport = mock_transport({})
+        async with httpx.AsyncClient(transport=transport) as client:
+            result = await download_month_async(client, 2021, 3, tmp_path)
+
+        assert result is True
+        assert existing_file.read_text() == "Existing content"
+
+
+class TestDownloadMonths:
+    """Test the download_months function."""
+
+    @pytest.mark.asyncio
+    async def test_downloads_months_in_order(self, tmp_path: Path) -> None:
+        """Test results line up with the requested months."""
+        transport = mock_transport({"/workout/2021/03": 200, "/workout/2021/05": 200})
+        real_client = httpx.AsyncClient
+
+        def client_factory(**kwargs: Any) -> httpx.AsyncClient:
+            kwargs.pop("http2")
+            return real_client(transport=transport, **kwargs)
+
+        with patch(
+            "wodrag.data_processing.downloader.httpx.AsyncClient", client_factory
+        ):
+            results = await download_months(
+                [(2021, 3), (2021, 4), (2021, 5)], tmp_path / "raw"
+            )
+
+        assert results == [True, False, True]
+        assert (tmp_path / "raw" / "2021-03.html").exists()
+        assert not (tmp_path / "raw" / "2021-04.html").exists()
+        assert (tmp_path / "raw" / "2021-05.html").exists()
@@ -1,8 +1,33 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
+import openai
 import pytest
 
-from wodrag.services.embedding_service import EmbeddingService
+from wodrag.services.embedding_service import (
+    CHARS_PER_TOKEN,
+    MAX_ATTEMPTS,
+    MAX_BATCH_INPUTS,
+    MAX_BATCH_TOKENS,
+    AdaptiveLimiter,
+    EmbeddingCache,
+    EmbeddingService,
+    chunk_texts,
+    query_embedding_cache,
+    retry_delay,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_query_embedding_cache() -> None:
+    query_embedding_cache.clear()
+
+
+def make_rate_limit_error(retry_after: str | None = None) -> openai.RateLimitError:
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("Rate limited", response=response, body=None)
 
 
 class TestEmbeddingService:
@@ -69,6 +94,25 @@ class TestEmbeddingService:
             model="text-embedding-3-small", input="test text"
         )
 
+    @patch("wodrag.services.embedding_service.OpenAI")
+    @patch("wodrag.services.embedding_service.os.getenv")
+    def test_generate_embedding_reuses_cached_query(
+        self, mock_getenv: MagicMock, mock_openai: MagicMock
+    ) -> None:
+        mock_getenv.return_value = "test-api-key"
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.embeddings.create.return_value.data = [
+            MagicMock(embedding=[0.1, 0.2])
+        ]
+
+        first = EmbeddingService().generate_embedding("test text")
+        # A new instance shares the cache, and whitespace is stripped first
+        second = EmbeddingService().generate_embedding(" test text ")
+
+        assert first == second == [0.1, 0.2]
+        mock_client.embeddings.create.assert_called_once()
+
     @patch("wodrag.services.embedding_service.os.getenv")
     def test_generate_embedding_empty_text(self, mock_getenv: MagicMock) -> None:
         mock_getenv.return_value = "test-api-key"
@@ -143,6 +187,29 @@ class TestEmbeddingService:
             model="text-embedding-3-small", input=["text 2"]
         )
 
+    @patch("wodrag.services.embedding_service.OpenAI")
+    @patch("wodrag.services.embedding_service.os.getenv")
+    def test_generate_batch_embeddings_splits_large_batches(
+        self, mock_getenv: MagicMock, mock_openai: MagicMock
+    ) -> None:
+        mock_getenv.return_value = "test-api-key"
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        def create(model: str, input: list[str]) -> MagicMock:
+            response = MagicMock()
+            response.data = [MagicMock(embedding=[float(t)]) for t in input]
+            return response
+
+        mock_client.embeddings.create.side_effect = create
+
+        service = EmbeddingService()
+        texts = [str(i) for i in range(MAX_BATCH_INPUTS + 5)]
+        results = service.generate_batch_embeddings(texts)
+
+        assert mock_client.embeddings.create.call_count == 2
+        assert results == [[float(i)] for i in range(MAX_BATCH_INPUTS + 5)]
+
     @patch("wodrag.services.embedding_service.os.getenv")
     def test_generate_batch_embeddings_empty_list(self, mock_getenv: MagicMock) -> None:
         mock_getenv.return_value = "test-api-key"
@@ -178,6 +245,129 @@ class TestEmbeddingService:
 
         assert "Failed to generate batch embeddings" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    @patch("wodrag.services.embedding_service.AsyncOpenAI")
+    @patch("wodrag.services.embedding_service.os.getenv")
+    async def test_generate_batch_embeddings_async_preserves_order(
+        self, mock_getenv: MagicMock, mock_async_openai: MagicMock
+    ) -> None:
+        mock_getenv.return_value = "test-api-key"
+        mock_client = MagicMock()
+        mock_async_openai.return_value = mock_client
+
+        async def create(model: str, input: list[str]) -> MagicMock:
+            response = MagicMock()
+            response.data = [MagicMock(embedding=[float(t)]) for t in input]
+            return response
+
+        mock_client.embeddings.create = AsyncMock(side_effect=create)
+
+        service = EmbeddingService(parallelism=2)
+        texts = [str(i) for i in range(MAX_BATCH_INPUTS * 2 + 3)]
+        texts[1] = "  "
+        results = await service.generate_batch_embeddings_async(texts)
+
+        assert mock_client.embeddings.create.await_count == 3
+        assert results[0] == [0.0]
+        assert results[1] == []
+        assert results[-1] == [float(len(texts) - 1)]
+
+    @pytest.mark.asyncio
+    @patch("wodrag.services.embedding_service.AsyncOpenAI")
+    @patch("wodrag.services.embedding_service.os.getenv")
+    async def test_generate_batch_embeddings_async_api_error(
+        self, mock_getenv: MagicMock, mock_async_openai: MagicMock
+    ) -> None:
+        mock_getenv.return_value = "test-api-key"
+        mock_client = MagicMock()
+        mock_async_openai.return_value = mock_client
+        mock_client.embeddings.create = AsyncMock(
+            side_effect=openai.OpenAIError("Batch API Error")
+        )
+
+        service = EmbeddingService()
+
+        with pytest.raises(RuntimeError) as exc_info:
+            await service.generate_batch_embeddings_async(["text 1"])
+
+        assert "Failed to generate batch embeddings" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    @patch("wodrag.services.embedding_service.asyncio.sleep", new_callable=AsyncMock)
+    @patch("wodrag.services.embedding_service.AsyncOpenAI")
+    @patch("wodrag.services.embedding_service.os.getenv")
+    async def test_generate_batch_embeddings_async_retries_rate_limit(
+        self,
+        mock_getenv: MagicMock,
+        mock_async_openai: MagicMock,
+        mock_sleep: AsyncMock,
+    ) -> None:
+        mock_getenv.return_value = "test-api-key"
+        mock_client = MagicMock()
+        mock_async_openai.return_value = mock_client
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[0.1, 0.2])]
+        mock_client.embeddings.create = AsyncMock(
+            side_effect=[make_rate_limit_error("3"), response]
+        )
+
+        service = EmbeddingService()
+        results = await service.generate_batch_embeddings_async(["text 1"])
+
+        assert results == [[0.1, 0.2]]
+        assert mock_client.embeddings.create.await_count == 2
+        mock_sleep.assert_awaited_once_with(3.0)
+
+    @pytest.mark.asyncio
+    @patch("wodrag.services.embedding_service.asyncio.sleep", new_callable=AsyncMock)
+    @patch("wodrag.services.embedding_service.AsyncOpenAI")
+    @patch("wodrag.services.embedding_service.os.getenv")
+    async def test_rate_limit_backoff_carries_across_calls(
+        self,
+        mock_getenv: MagicMock,
+        mock_async_openai: MagicMock,
+        mock_sleep: AsyncMock,
+    ) -> None:
+        mock_getenv.return_value = "test-api-key"
+        mock_client = MagicMock()
+        mock_async_openai.return_value = mock_client
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[0.1, 0.2])]
+        mock_client.embeddings.create = AsyncMock(
+            side_effect=[make_rate_limit_error("1"), response, response]
+        )
+
+        service = EmbeddingService(parallelism=4)
+        await service.generate_batch_embeddings_async(["text 1"])
+        limiter = service._get_limiter()
+        await service.generate_batch_embeddings_async(["text 2"])
+
+        assert service._get_limiter() is limiter
+        assert limiter.limit == 2
+
+    @pytest.mark.asyncio
+    @patch("wodrag.services.embedding_service.asyncio.sleep", new_callable=AsyncMock)
+    @patch("wodrag.services.embedding_service.AsyncOpenAI")
+    @patch("wodrag.services.embedding_service.os.getenv")
+    async def test_generate_batch_embeddings_async_gives_up_after_max_attempts(
+        self,
+        mock_getenv: MagicMock,
+        mock_async_openai: MagicMock,
+        mock_sleep: AsyncMock,
+    ) -> None:
+        mock_getenv.return_value = "test-api-key"
+        mock_client = MagicMock()
+        mock_async_openai.return_value = mock_client
+        mock_client.embeddings.create = AsyncMock(side_effect=make_rate_limit_error())
+
+        service = EmbeddingService()
+
+        with pytest.raises(RuntimeError):
+            await service.generate_batch_embeddings_async(["text 1"])
+
+        assert mock_client.embeddings.create.await_count == MAX_ATTEMPTS
+        assert mock_sleep.await_count == MAX_ATTEMPTS - 1
+
     @patch("wodrag.services.embedding_service.os.getenv")
     def test_custom_model(self, mock_getenv: MagicMock) -> None:
         mock_getenv.return_value = "test-api-key"
@@ -185,3 +375,103 @@ class TestEmbeddingService:
         service = EmbeddingService(model="text-embedding-ada-002")
 
         assert service.model == "text-embedding-ada-002"
+
+
+class TestChunkTexts:
+    def test_small_batch_is_one_chunk(self) -> None:
+        assert chunk_texts(["a", "b", "c"]) == [["a", "b", "c"]]
+
+    def test_empty_input(self) -> None:
+        assert chunk_texts([]) == []
+
+    def test_splits_on_input_count(self) -> None:
+        texts = ["x"] * (MAX_BATCH_INPUTS * 2 + 1)
+        chunks = chunk_texts(texts)
+
+        assert [len(chunk) for chunk in chunks] == [
+            MAX_BATCH_INPUTS,
+            MAX_BATCH_INPUTS,
+            1,
+        ]
+
+    def test_splits_on_estimated_tokens(self) -> None:
+        long_text = "x" * (MAX_BATCH_TOKENS * CHARS_PER_TOKEN // 2 + 1)
+        chunks = chunk_texts([long_text, long_text, "short"])
+
+        assert chunks == [[long_text], [long_text, "short"]]
+
+
+class TestRetryDelay:
+    def test_uses_retry_after_header(self) -> None:
+        assert retry_delay(make_rate_limit_error("7"), attempt=0) == 7.0
+
+    def test_exponential_backoff_with_jitter(self) -> None:
+        error = make_rate_limit_error()
+
+        assert 0.75 <= retry_delay(error, attempt=0) <= 1.25
+        assert 3.0 <= retry_delay(error, attempt=2) <= 5.0
+
+    def test_invalid_retry_after_falls_back_to_backoff(self) -> None:
+        assert 0.75 <= retry_delay(make_rate_limit_error("soon"), attempt=0) <= 1.25
+
+
+class TestAdaptiveLimiter:
+    @pytest.mark.asyncio
+    async def test_rate_limit_halves_limit(self) -> None:
+        limiter = AdaptiveLimiter(8)
+
+        await limiter.acquire()
+        await limiter.release(rate_limited=True)
+
+        assert limiter.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_limit_never_drops_below_one(self) -> None:
+        limiter = AdaptiveLimiter(1)
+
+        await limiter.acquire()
+        await limiter.release(rate_limited=True)
+
+        assert limiter.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_successes_restore_limit(self) -> None:
+        limiter = AdaptiveLimiter(4, recovery_successes=2)
+        await limiter.acquire()
+        await limiter.release(rate_limited=True)
+
+        for _ in range(2):
+            await limiter.acquire()
+            await limiter.release()
+
+        assert limiter.limit == 3
+
+
+class TestEmbeddingCache:
+    def test_miss_returns_none(self) -> None:
+        assert EmbeddingCache().get("model", "text") is None
+
+    def test_keyed_by_model(self) -> None:
+        cache = EmbeddingCache()
+        cache.put("model-a", "text", [0.1])
+
+        assert cache.get("model-a", "text") == [0.1]
+        assert cache.get("model-b", "text") is None
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = EmbeddingCache(maxsize=2)
+        cache.put("model", "a", [0.1])
+        cache.put("model", "b", [0.2])
+        cache.get("model", "a")
+        cache.put("model", "c", [0.3])
+
+        assert cache.get("model", "a") == [0.1]
+        assert cache.get("model", "b") is None
+        assert cache.get("model", "c") == [0.3]
+
+    def test_returns_copies(self) -> None:
+        cache = EmbeddingCache()
+        cache.put("model", "text", [0.1])
+        cache.get("model", "text").append(0.2)  # type: ignore[union-attr]
+
+        assert cache.get("model", "text") == [0.1]
@@ -0,0 +1,72 @@
+"""Tests for the simple workout parser."""
+
+from wodrag.data_processing.simple_parser import (
+    clean_workout_text,
+    parse_workout_simple,
+)
+
+
+class TestParseWorkoutSimple:
+    """Test the parse_workout_simple function."""
+
+    def test_short_text_returned_as_workout(self) -> None:
+        """Test that text without date headers is returned unchanged."""
+        result = parse_workout_simple("  Rest Day \n")
+        assert result == {"workout": "Rest Day", "scaling": None}
+
+    def test_skips_date_header_lines(self) -> None:
+        """Test that the first two lines are treated as date headers."""
+        result = parse_workout_simple("Monday\n250801\nFor time:\n21-15-9 thrusters")
+        assert result == {"workout": "For time:\n21-15-9 thrusters", "scaling": None}
+
+    def test_splits_scaling_section(self) -> None:
+        """Test that the scaling marker starts the scaling section."""
+        raw_text = "Monday\n250801\n5 rounds\n10 pull-ups\nScaling: Use ring rows"
+        result = parse_workout_simple(raw_text)
+        assert result["workout"] == "5 rounds\n10 pull-ups"
+        assert result["scaling"] == "Scaling: Use ring rows"
+
+    def test_earliest_marker_wins(self) -> None:
+        """Test that the earliest of several scaling markers is used."""
+        raw_text = (
+            "Monday\n250801\nFran\n"
+            "BEGINNER OPTION: 45-lb thrusters\n"
+            "scaling: Reduce the load"
+        )
+        result = parse_workout_simple(raw_text)
+        assert result["workout"] == "Fran"
+        assert result["scaling"] == (
+            "BEGINNER OPTION: 45-lb thrusters\nscaling: Reduce the load"
+        )
+
+    def test_marker_requires_word_boundary(self) -> None:
+        """Test that markers embedded in other words are ignored."""
+        raw_text = "Monday\n250801\nDescaling: not a marker"
+        result = parse_workout_simple(raw_text)
+        assert result == {"workout": "Descaling: not a marker", "scaling": None}
+
+    def test_marker_after_other_colons(self) -> None:
+        """Test that colons which do not end a marker are skipped."""
+        raw_text = (
+            "Monday\n250801\nFor time:\nRest 1:00\nIntermediate Option: 65-lb thrusters"
+        )
+        result = parse_workout_simple(raw_text)
+        assert result["workout"] == "For time:\nRest 1:00"
+        assert result["scaling"] == "Intermediate Option: 65-lb thrusters"
+
+    def test_marker_at_start_of_content(self) -> None:
+        """Test a marker that begins right after the date headers."""
+        result = parse_workout_simple("Monday\n250801\nScaling: Walk")
+        assert result == {"workout": "Scaling: Walk", "scaling": "Scaling: Walk"}
+
+
+class TestCleanWorkoutText:
+    """Test the clean_workout_text function."""
+
+    def test_collapses_whitespace(self) -> None:
+        """Test blank lines and repeated spaces are collapsed."""
+        assert clean_workout_text("a\n\n\nb  c\t d") == "a\nb c d"
+
+    def test_removes_trailing_period_line(self) -> None:
+        """Test a trailing formatting period is removed."""
+        assert clean_workout_text("Run 400 m\n. ") == "Run 400 m"
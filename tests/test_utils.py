@@ -0,0 +1,27 @@
+import pytest
+
+from wodrag.utils import is_exact_lexical_query, quoted_phrase
+
+
+class TestQuotedPhrase:
+    def test_returns_text_inside_quotes(self) -> None:
+        assert quoted_phrase('"pogo stick"') == "pogo stick"
+
+    def test_ignores_surrounding_whitespace(self) -> None:
+        assert quoted_phrase('  " pogo stick "  ') == "pogo stick"
+
+    @pytest.mark.parametrize("query", ["pogo stick", '"pogo stick', '""', '" "'])
+    def test_unquoted_or_empty_returns_none(self, query: str) -> None:
+        assert quoted_phrase(query) is None
+
+
+class TestIsExactLexicalQuery:
+    @pytest.mark.parametrize("query", ['"pogo stick"', "Fran", "Murph", "DT"])
+    def test_exact_queries(self, query: str) -> None:
+        assert is_exact_lexical_query(query)
+
+    @pytest.mark.parametrize(
+        "query", ["fran", "Fran workout", "heavy squats", '"', '""', "Fran5"]
+    )
+    def test_descriptive_queries(self, query: str) -> None:
+        assert not is_exact_lexical_query(query)
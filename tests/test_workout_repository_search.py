@@ -0,0 +1,175 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from wodrag.database.models import WorkoutFilter
+from wodrag.database.workout_repository import HNSW_EF_SEARCH, WorkoutRepository
+
+# Every tenth workout is a hero workout, so a hero filter keeps few of the
+# nearest candidates
+WORKOUTS = [
+    {"id": i, "workout_type": "hero" if i % 10 == 0 else "girl"} for i in range(1, 201)
+]
+
+
+class FakeHNSWCursor:
+    """Cursor that mimics an HNSW scan: without an iterative scan, filters
+    only see the ef_search nearest candidates."""
+
+    def __init__(self) -> None:
+        self.ef_search = HNSW_EF_SEARCH
+        self.iterative_scan = False
+        self.rows: list[tuple[Any, ...]] = []
+        self.description = [("id",), ("workout_type",), ("distance",)]
+        self.itersize = 0
+
+    def __enter__(self) -> "FakeHNSWCursor":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        pass
+
+    def __iter__(self) -> Any:
+        return iter(self.rows)
+
+    def execute(self, sql: str, params: tuple[Any, ...] = ()) -> None:
+        if "hnsw.ef_search" in sql:
+            self.ef_search = params[0]
+            return
+        if "hnsw.iterative_scan" in sql:
+            self.iterative_scan = True
+            return
+
+        candidates = WORKOUTS if self.iterative_scan else WORKOUTS[: self.ef_search]
+        if "workout_type = %s" in sql:
+            candidates = [w for w in candidates if w["workout_type"] in params]
+        limit = params[-1]
+        self.rows = [
+            (w["id"], w["workout_type"], -1 + w["id"] / 1000)
+            for w in candidates[:limit]
+        ]
+
+    def fetchall(self) -> list[tuple[Any, ...]]:
+        return self.rows
+
+
+@pytest.fixture
+def repository() -> WorkoutRepository:
+    cursor = FakeHNSWCursor()
+    conn = MagicMock()
+    conn.cursor.side_effect = lambda name=None: cursor
+
+    @contextmanager
+    def connection_factory() -> Generator[MagicMock, None, None]:
+        yield conn
+
+    embedding_service = MagicMock()
+    embedding_service.generate_embedding.return_value = [0.1, 0.2]
+    return WorkoutRepository(
+        embedding_service=embedding_service, connection_factory=connection_factory
+    )
+
+
+class TestFilteredVectorSearch:
+    def test_filtered_search_returns_limit_rows(
+        self, repository: WorkoutRepository
+    ) -> None:
+        results = repository.search_summaries(
+            "hero", limit=5, filters=WorkoutFilter(workout_type="hero")
+        )
+
+        assert [r.workout.id for r in results] == [10, 20, 30, 40, 50]
+        assert all(r.workout.workout_type == "hero" for r in results)
+
+    def test_filtered_stream_returns_limit_rows(
+        self, repository: WorkoutRepository
+    ) -> None:
+        results = list(
+            repository.iter_search_summaries(
+                "hero", limit=5, filters=WorkoutFilter(workout_type="hero")
+            )
+        )
+
+        assert len(results) == 5
+
+    def test_unfiltered_search_skips_iterative_scan(self) -> None:
+        cursor = MagicMock()
+        cursor.fetchall.return_value = []
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value = cursor
+
+        @contextmanager
+        def connection_factory() -> Generator[MagicMock, None, None]:
+            yield conn
+
+        embedding_service = MagicMock()
+        embedding_service.generate_embedding.return_value = [0.1]
+        repository = WorkoutRepository(
+            embedding_service=embedding_service,
+            connection_factory=connection_factory,
+        )
+
+        repository.search_summaries("hero", limit=5)
+
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        assert not any("iterative_scan" in sql for sql in statements)
+
+
+class TestTextSearch:
+    def _repository(self, cursor: MagicMock) -> WorkoutRepository:
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value = cursor
+
+        @contextmanager
+        def connection_factory() -> Generator[MagicMock, None, None]:
+            yield conn
+
+        return WorkoutRepository(connection_factory=connection_factory)
+
+    def test_phrase_search_matches_phrase_tokens(self) -> None:
+        cursor = MagicMock()
+        cursor.fetchall.return_value = []
+        repository = self._repository(cursor)
+
+        repository.text_search_workouts("Pogo stick", limit=5, phrase=True)
+
+        sql, params = cursor.execute.call_args.args
+        assert "paradedb.phrase('workout', %s::text[])" in sql
+        assert "paradedb.match" not in sql
+        assert params == (*[["pogo", "stick"]] * 4, 5)
+
+    def test_default_search_matches_any_term(self) -> None:
+        cursor = MagicMock()
+        cursor.fetchall.return_value = []
+        repository = self._repository(cursor)
+
+        repository.text_search_workouts("pogo stick", limit=5)
+
+        sql, params = cursor.execute.call_args.args
+        assert "paradedb.match('workout', %s)" in sql
+        assert params == ("pogo stick",) * 4 + (5,)
+
+
+class TestSimilarWorkouts:
+    def test_summary_similarity_orders_by_indexed_expression(self) -> None:
+        cursor = MagicMock()
+        cursor.fetchone.return_value = ("[0.1,0.2]",)
+        cursor.fetchall.return_value = [(2, -0.9)]
+        cursor.description = [("id",), ("distance",)]
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value = cursor
+
+        @contextmanager
+        def connection_factory() -> Generator[MagicMock, None, None]:
+            yield conn
+
+        repository = WorkoutRepository(connection_factory=connection_factory)
+        results = repository.get_similar_workouts(1, limit=3)
+
+        sql, params = cursor.execute.call_args.args
+        assert "summary_embedding::halfvec(1536) <#> %s::halfvec(1536)" in sql
+        assert params == ("[0.1,0.2]", 1, 3)
+        assert [(r.workout.id, r.similarity_score) for r in results] == [(2, 0.9)]
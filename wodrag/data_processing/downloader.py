@@ -1,14 +1,28 @@
 """Download CrossFit workout pages from crossfit.com."""
 
+import asyncio
 import logging
 import time
 from collections.abc import Iterator
 from pathlib import Path
 
+import httpx
 import requests
 
 logger = logging.getLogger(__name__)
 
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    )
+}
+
+
+def month_url(year: int, month: int) -> str:
+    """Return the crossfit.com workout page URL for a month."""
+    return f"https://www.crossfit.com/workout/{year}/{month:02d}"
+
 
 def generate_months(
     start_year: int, start_month: int, end_year: int, end_month: int
@@ -50,7 +64,7 @@ def download_month(year: int, month: int, output_dir: Path, timeout: int = 30) -
     Returns:
         True if download was successful, False otherwise
     """
-    url = f"https://www.crossfit.com/workout/{year}/{month:02d}"
+    url = month_url(year, month)
     filename = output_dir / f"{year}-{month:02d}.html"
 
     # Skip if file already exists
@@ -58,16 +72,9 @@ def download_month(year: int, month: int, output_dir: Path, timeout: int = 30) -
         logger.info(f"Skipping {filename.name} - already exists")
         return True
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        )
-    }
-
     try:
         logger.info(f"Downloading {url}")
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = requests.get(url, headers=HEADERS, timeout=timeout)
         response.raise_for_status()
 
         # Save the HTML content
@@ -80,6 +87,77 @@ def download_month(year: int, month: int, output_dir: Path, timeout: int = 30) -
         return False
 
 
+async def download_month_async(
+    client: httpx.AsyncClient, year: int, month: int, output_dir: Path
+) -> bool:
+    """Download a single month's workout HTML using a shared async client.
+
+    Args:
+        client: Client to send the request with
+        year: Year to download
+        month: Month to download (1-12)
+        output_dir: Directory to save HTML files
+
+    Returns:
+        True if download was successful, False otherwise
+    """
+    url = month_url(year, month)
+    filename = output_dir / f"{year}-{month:02d}.html"
+
+    # Skip if file already exists
+    if filename.exists():
+        logger.info(f"Skipping {filename.name} - already exists")
+        return True
+
+    try:
+        logger.info(f"Downloading {url}")
+        response = await client.get(url)
+        response.raise_for_status()
+
+        # Save the HTML content without blocking the event loop
+        await asyncio.to_thread(filename.write_text, response.text, encoding="utf-8")
+        logger.info(f"Saved {filename.name} ({len(response.text)} bytes)")
+        return True
+
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to download {url}: {e}")
+        return False
+
+
+async def download_months(
+    months: list[tuple[int, int]],
+    output_dir: Path,
+    timeout: int = 30,
+    max_connections: int = 8,
+) -> list[bool]:
+    """Download several months concurrently over one HTTP/2 client.
+
+    Args:
+        months: (year, month) tuples to download
+        output_dir: Directory to save HTML files
+        timeout: Request timeout in seconds
+        max_connections: Maximum concurrent connections
+
+    Returns:
+        Success flags in the same order as months
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    async with httpx.AsyncClient(
+        http2=True,
+        headers=HEADERS,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=max_connections),
+    ) as client:
+        return list(
+            await asyncio.gather(
+                *(
+                    download_month_async(client, year, month, output_dir)
+                    for year, month in months
+                )
+            )
+        )
+
+
 def download_all(
     output_dir: Path = Path("data/raw"),
     start_year: int = 2001,
@@ -2,6 +2,7 @@
 
 import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict, dataclass
 from pathlib import Path
 
@@ -56,7 +57,7 @@ def extract_workouts_from_file(file_path: Path) -> list[Workout]:
 
     try:
         with open(file_path, encoding="utf-8") as f:
-            soup = BeautifulSoup(f.read(), "html.parser")
+            soup = BeautifulSoup(f.read(), "lxml")
 
         # Find the archives section
         archives = soup.find("section", id="archives")
@@ -112,9 +113,10 @@ def extract_workouts_from_file(file_path: Path) -> list[Workout]:
             # Extract raw text content
             raw_text = div.get_text(separator="\n", strip=True)
 
-            # Check for videos and articles
-            has_video = bool(div.find("iframe")) or "video" in raw_text.lower()
-            has_article = "article" in raw_text.lower() or "journal" in raw_text.lower()
+            # Check for videos and articles (lowercase the text only once)
+            text_lower = raw_text.lower()
+            has_video = bool(div.find("iframe")) or "video" in text_lower
+            has_article = "article" in text_lower or "journal" in text_lower
 
             # Parse workout content using the simple parser
             parsed_data = parse_workout_simple(raw_text)
@@ -143,6 +145,24 @@ def extract_workouts_from_file(file_path: Path) -> list[Workout]:
     return workouts
 
 
+def _extract_file_to_json(file_path: Path, output_dir: Path) -> int:
+    """Extract one HTML file to JSON. Returns the number of workouts saved."""
+    workouts = extract_workouts_from_file(file_path)
+    if not workouts:
+        return 0
+
+    # Convert to JSON-serializable format
+    workouts_data = [asdict(w) for w in workouts]
+
+    # Save to JSON file with same name
+    output_file = output_dir / f"{file_path.stem}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(workouts_data, f, indent=2, ensure_ascii=False)
+
+    logger.info(f"Saved {len(workouts)} workouts to {output_file.name}")
+    return len(workouts)
+
+
 def extract_all_workouts(
     input_dir: Path = Path("data/raw"), output_dir: Path = Path("data/processed/json")
 ) -> None:
@@ -160,23 +180,12 @@ def extract_all_workouts(
     html_files = sorted(input_dir.glob("*.html"))
     logger.info(f"Found {len(html_files)} HTML files to process")
 
-    total_workouts = 0
-
-    for file_path in html_files:
-        # Extract workouts
-        workouts = extract_workouts_from_file(file_path)
-
-        if workouts:
-            # Convert to JSON-serializable format
-            workouts_data = [asdict(w) for w in workouts]
-
-            # Save to JSON file with same name
-            output_file = output_dir / f"{file_path.stem}.json"
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(workouts_data, f, indent=2, ensure_ascii=False)
-
-            logger.info(f"Saved {len(workouts)} workouts to {output_file.name}")
-            total_workouts += len(workouts)
+    # HTML parsing is CPU-bound, so spread the files across processes
+    with ProcessPoolExecutor() as executor:
+        counts = executor.map(
+            _extract_file_to_json, html_files, [output_dir] * len(html_files)
+        )
+        total_workouts = sum(counts)
 
     logger.info(f"Extraction complete: {total_workouts} total workouts extracted")
 
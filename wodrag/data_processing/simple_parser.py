@@ -2,6 +2,39 @@
 
 import re
 
+# Markers that start the scaling section, combined into one alternation so a
+# single scan finds the leftmost marker. Alternatives are ordered by how often
+# they appear in the archive, and the first-letter lookahead rejects most word
+# boundaries before any alternative is tried.
+_SCALING_RE = re.compile(
+    r"\b(?=[sbia])"
+    r"(?:scaling|intermediate option|beginner option|advanced option):",
+    re.IGNORECASE,
+)
+# Longest marker before its colon; every match ends at a colon within this reach
+_MAX_MARKER_LEN = len("intermediate option")
+
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+_INLINE_WHITESPACE_RE = re.compile(r"[ \t]+")
+_TRAILING_PERIOD_RE = re.compile(r"\n\.\s*$")
+
+
+def _find_scaling_start(content: str) -> int | None:
+    """Return the start of the first scaling marker in content, if any.
+
+    Every marker ends in a colon, so colons are located with str.find and the
+    regex only runs on the short window ending at each one. Markers contain no
+    colon themselves, so the first colon that completes a marker also gives
+    the leftmost marker.
+    """
+    colon = content.find(":")
+    while colon != -1:
+        match = _SCALING_RE.search(content, max(0, colon - _MAX_MARKER_LEN), colon + 1)
+        if match:
+            return match.start()
+        colon = content.find(":", colon + 1)
+    return None
+
 
 def parse_workout_simple(raw_text: str) -> dict[str, str | None]:
     """
@@ -10,28 +43,17 @@ def parse_workout_simple(raw_text: str) -> dict[str, str | None]:
     Returns:
         dict with 'workout' (always str) and 'scaling' (str or None) keys
     """
-    lines = raw_text.split("\n")
-
-    # Skip first two lines (date headers)
+    # Skip first two lines (date headers); only the first two newlines
+    # matter, so split at most twice instead of splitting and re-joining
+    # every line of the body
+    lines = raw_text.split("\n", 2)
     if len(lines) < 3:
         return {"workout": raw_text.strip(), "scaling": None}
 
-    content_lines = lines[2:]  # Skip date lines
-    content = "\n".join(content_lines)
+    content = lines[2]
 
     # Find where scaling section starts
-    scaling_patterns = [
-        r"\bscaling:",
-        r"\bbeginner option:",
-        r"\bintermediate option:",
-        r"\badvanced option:",
-    ]
-
-    scaling_start = None
-    for pattern in scaling_patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match and (scaling_start is None or match.start() < scaling_start):
-            scaling_start = match.start()
+    scaling_start = _find_scaling_start(content)
 
     # If scaling section exists, workout ends there, otherwise use full content
     workout_end = scaling_start if scaling_start is not None else len(content)
@@ -51,10 +73,10 @@ def parse_workout_simple(raw_text: str) -> dict[str, str | None]:
 def clean_workout_text(workout_text: str) -> str:
     """Clean up workout text by removing common noise."""
     # Remove extra whitespace
-    workout_text = re.sub(r"\n\s*\n", "\n", workout_text)
-    workout_text = re.sub(r"[ \t]+", " ", workout_text)
+    workout_text = _BLANK_LINES_RE.sub("\n", workout_text)
+    workout_text = _INLINE_WHITESPACE_RE.sub(" ", workout_text)
 
     # Remove trailing periods that are just formatting
-    workout_text = re.sub(r"\n\.\s*$", "", workout_text)
+    workout_text = _TRAILING_PERIOD_RE.sub("", workout_text)
 
     return workout_text.strip()
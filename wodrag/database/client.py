@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import os
-from collections.abc import Generator
+from collections.abc import Generator, Sequence
 from contextlib import contextmanager
+from functools import cache
 
 import psycopg2
+import psycopg2.pool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -22,3 +24,47 @@ def get_postgres_connection() -> Generator[psycopg2.extensions.connection, None,
         yield conn
     finally:
         conn.close()
+
+
+@cache
+def get_connection_pool(maxconn: int = 10) -> psycopg2.pool.ThreadedConnectionPool:
+    """Get the process-wide PostgreSQL connection pool, creating it on first use."""
+    db_url = os.getenv("DATABASE_URL")
+    if not db_url:
+        raise ValueError("DATABASE_URL not found in environment")
+
+    return psycopg2.pool.ThreadedConnectionPool(1, maxconn, db_url)
+
+
+@contextmanager
+def get_pooled_connection() -> Generator[psycopg2.extensions.connection, None, None]:
+    """Borrow a PostgreSQL connection from the shared pool.
+
+    Reusing pooled connections skips the TCP, TLS and auth handshake that
+    get_postgres_connection pays on every call. Any uncommitted transaction
+    is rolled back before the connection goes back to the pool.
+    """
+    pool = get_connection_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        if not conn.closed:
+            conn.rollback()
+        pool.putconn(conn, close=bool(conn.closed))
+
+
+def format_vector(values: Sequence[float]) -> str:
+    """Format an embedding as a compact pgvector text literal.
+
+    pgvector stores float4 components, so nine significant digits round-trip
+    exactly while sending far fewer bytes than the float8 ARRAY psycopg2
+    builds from a list of Python floats.
+    """
+    return "[" + ",".join(f"{value:.9g}" for value in values) + "]"
+
+
+def parse_vector(literal: str) -> list[float]:
+    """Parse a pgvector text literal such as ``[0.1,0.2]`` into floats."""
+    body = literal.strip()[1:-1]
+    return [float(value) for value in body.split(",")] if body else []
@@ -44,6 +44,23 @@ class DuckDBQueryService:
             columns = [desc[0] for desc in conn.description] if conn.description else []
             return [dict(zip(columns, row, strict=True)) for row in result]
 
+    def execute_query_head(
+        self, query: str, limit: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Execute a query, returning its first rows as dictionaries and the
+        total row count. Rows past the limit are only counted, never turned
+        into dictionaries."""
+        with self.get_connection() as conn:
+            cursor = conn.execute(query)
+            columns = [desc[0] for desc in conn.description] if conn.description else []
+            head = [
+                dict(zip(columns, row, strict=True)) for row in cursor.fetchmany(limit)
+            ]
+            total = len(head)
+            while batch := cursor.fetchmany(10_000):
+                total += len(batch)
+            return head, total
+
     def get_workouts_by_query(self, query: str) -> list[Workout]:
         """Execute a query that returns workout data and convert to Workout objects."""
         results = self.execute_query(query)
@@ -1,32 +1,54 @@
 from __future__ import annotations
 
-from collections.abc import Generator
-from contextlib import contextmanager
+import re
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager
 from datetime import date
 from typing import TYPE_CHECKING, Any
 
 import psycopg2
+from psycopg2.extras import execute_values
 
-from .client import get_postgres_connection
+from .client import format_vector, get_postgres_connection
 from .models import SearchResult, Workout, WorkoutFilter
 
 if TYPE_CHECKING:
     from ..services.embedding_service import EmbeddingService
 
+ConnectionFactory = Callable[[], AbstractContextManager[psycopg2.extensions.connection]]
+
+# The summary HNSW index is built over this half-precision cast, so vector
+# searches must order by the same expression for the index to serve them.
+SUMMARY_EMBEDDING_HALF = "summary_embedding::halfvec(1536)"
+
+# Candidates the summary HNSW index examines per search (pgvector's default).
+# Raised to the query's limit when that is larger, since a scan returns at
+# most ef_search rows.
+HNSW_EF_SEARCH = 40
+
+# Text fields covered by the BM25 index that text searches match against
+TEXT_SEARCH_FIELDS = ("workout", "one_sentence_summary", "workout_name", "scaling")
+
 
 class WorkoutRepository:
     """Repository for workout database operations."""
 
-    def __init__(self, embedding_service: EmbeddingService | None = None) -> None:
+    def __init__(
+        self,
+        embedding_service: EmbeddingService | None = None,
+        connection_factory: ConnectionFactory = get_postgres_connection,
+    ) -> None:
         self.table_name = "workouts"
         self.embedding_service = embedding_service
+        # Pass get_pooled_connection to reuse connections across calls
+        self.connection_factory = connection_factory
 
     @contextmanager
     def _get_pg_connection(
         self,
     ) -> Generator[psycopg2.extensions.connection, None, None]:
         """Get a direct PostgreSQL connection with proper cleanup."""
-        with get_postgres_connection() as conn:
+        with self.connection_factory() as conn:
             yield conn
 
     # CRUD Operations
@@ -128,6 +150,9 @@ class WorkoutRepository:
         Uses pgvector distance to the target workout's embedding. If the
         target workout has no embedding, returns an empty list.
 
+        Embeddings are unit length, so the inner product ranks and scores
+        exactly like cosine similarity without computing norms per row.
+
         Args:
             workout_id: ID of the anchor workout
             limit: number of similar workouts to return
@@ -152,18 +177,21 @@ class WorkoutRepository:
                 if not anchor or anchor[0] is None:
                     return []
 
-                # Select others ordered by distance to the anchor's embedding
+                # Bind the anchor's embedding as a constant, ordering by the
+                # indexed expression, so the vector index can serve the query
+                if embedding != "workout":
+                    self._set_hnsw_ef_search(cursor, limit)
+                    distance = f"{SUMMARY_EMBEDDING_HALF} <#> %s::halfvec(1536)"
+                else:
+                    distance = "workout_embedding <#> %s::vector"
                 sql = f"""
-                    SELECT w.*, 1 - (w.{col} <=> anchor.emb) as similarity
-                    FROM workouts w
-                    CROSS JOIN (
-                        SELECT {col} AS emb FROM workouts WHERE id = %s
-                    ) AS anchor
-                    WHERE w.{col} IS NOT NULL AND w.id <> %s
-                    ORDER BY w.{col} <=> anchor.emb
+                    SELECT *, {distance} as distance
+                    FROM workouts
+                    WHERE {col} IS NOT NULL AND id <> %s
+                    ORDER BY distance
                     LIMIT %s
                 """
-                cursor.execute(sql, (workout_id, workout_id, limit))
+                cursor.execute(sql, (anchor[0], workout_id, limit))
                 rows = cursor.fetchall()
                 columns = (
                     [desc[0] for desc in cursor.description]
@@ -174,7 +202,7 @@ class WorkoutRepository:
                 results: list[SearchResult] = []
                 for row in rows:
                     row_dict = dict(zip(columns, row, strict=False))
-                    similarity = float(row_dict.pop("similarity", 0.0) or 0.0)
+                    similarity = -float(row_dict.pop("distance", 0.0) or 0.0)
                     workout = Workout.from_dict(row_dict)
                     results.append(
                         SearchResult(
@@ -209,7 +237,7 @@ class WorkoutRepository:
         if one_sentence_summary is not None:
             updates["one_sentence_summary"] = one_sentence_summary
         if summary_embedding is not None:
-            updates["summary_embedding"] = summary_embedding
+            updates["summary_embedding"] = format_vector(summary_embedding)
 
         if not updates:
             return self.get_workout(workout_id)
@@ -245,6 +273,63 @@ class WorkoutRepository:
         except psycopg2.Error as e:
             raise RuntimeError(f"Failed to update workout {workout_id}: {e}") from e
 
+    def update_workouts_metadata_bulk(self, updates: list[dict[str, Any]]) -> int:
+        """Update metadata for many workouts in one statement.
+
+        Each update is a dict with an ``id`` and any of the metadata fields
+        accepted by update_workout_metadata. As there, fields that are missing
+        or None keep their stored value. Returns the number of rows updated.
+        """
+        if not updates:
+            return 0
+
+        rows = []
+        for update in updates:
+            summary_embedding = update.get("summary_embedding")
+            rows.append(
+                (
+                    update["id"],
+                    update.get("movements"),
+                    update.get("equipment"),
+                    update.get("workout_type"),
+                    update.get("workout_name"),
+                    update.get("one_sentence_summary"),
+                    format_vector(summary_embedding) if summary_embedding else None,
+                )
+            )
+
+        try:
+            with self._get_pg_connection() as conn, conn.cursor() as cursor:
+                execute_values(
+                    cursor,
+                    """
+                    UPDATE workouts SET
+                        movements = COALESCE(v.movements, workouts.movements),
+                        equipment = COALESCE(v.equipment, workouts.equipment),
+                        workout_type = COALESCE(v.workout_type, workouts.workout_type),
+                        workout_name = COALESCE(v.workout_name, workouts.workout_name),
+                        one_sentence_summary = COALESCE(
+                            v.one_sentence_summary, workouts.one_sentence_summary
+                        ),
+                        summary_embedding = COALESCE(
+                            v.summary_embedding, workouts.summary_embedding
+                        )
+                    FROM (VALUES %s) AS v(
+                        id, movements, equipment, workout_type, workout_name,
+                        one_sentence_summary, summary_embedding
+                    )
+                    WHERE workouts.id = v.id
+                    """,
+                    rows,
+                    template="(%s, %s::text[], %s::text[], %s, %s, %s, %s::vector)",
+                    page_size=len(rows),
+                )
+                conn.commit()
+                return int(cursor.rowcount)
+
+        except psycopg2.Error as e:
+            raise RuntimeError(f"Failed to bulk update workout metadata: {e}") from e
+
     def delete_workout(self, workout_id: int) -> bool:
         """Delete a workout using PostgreSQL."""
         try:
@@ -257,6 +342,66 @@ class WorkoutRepository:
 
     # Search Methods
 
+    def _set_hnsw_ef_search(
+        self, cursor: Any, limit: int, filtered: bool = False
+    ) -> None:
+        """Size the HNSW candidate list for this transaction's vector search.
+
+        Filters are applied to the candidates the index returns, so a filtered
+        search could come back short or empty. For those, let pgvector (0.8+)
+        keep scanning the index until enough rows pass, still in exact order.
+        """
+        cursor.execute("SET LOCAL hnsw.ef_search = %s", (max(HNSW_EF_SEARCH, limit),))
+        if filtered:
+            cursor.execute("SET LOCAL hnsw.iterative_scan = strict_order")
+
+    def _filter_conditions(
+        self, filters: WorkoutFilter | None
+    ) -> tuple[list[str], list[Any]]:
+        """Build SQL conditions (ANDed together) and their values for filters.
+
+        Movements and equipment match if any of the given values is present,
+        as an array overlap (``&&``) that a GIN index on the column can serve.
+        """
+        conditions: list[str] = []
+        values: list[Any] = []
+        if not filters:
+            return conditions, values
+
+        if filters.movements:
+            conditions.append("movements && %s::text[]")
+            values.append(filters.movements)
+
+        if filters.equipment:
+            conditions.append("equipment && %s::text[]")
+            values.append(filters.equipment)
+
+        if filters.workout_type:
+            conditions.append("workout_type = %s")
+            values.append(filters.workout_type)
+
+        if filters.workout_name:
+            conditions.append("workout_name ILIKE %s")
+            values.append(f"%{filters.workout_name}%")
+
+        if filters.start_date:
+            conditions.append("date >= %s")
+            values.append(filters.start_date)
+
+        if filters.end_date:
+            conditions.append("date <= %s")
+            values.append(filters.end_date)
+
+        if filters.has_video is not None:
+            conditions.append("has_video = %s")
+            values.append(filters.has_video)
+
+        if filters.has_article is not None:
+            conditions.append("has_article = %s")
+            values.append(filters.has_article)
+
+        return conditions, values
+
     def _generate_query_embedding(self, query_text: str) -> list[float]:
         """Generate embedding for search query."""
         if not self.embedding_service:
@@ -270,42 +415,40 @@ class WorkoutRepository:
         query_embedding: list[float],
         limit: int,
         similarity_threshold: float | None = None,
+        filters: WorkoutFilter | None = None,
     ) -> list[tuple[Any, ...]]:
-        """Execute vector similarity SQL query."""
+        """Execute vector similarity SQL query.
+
+        Ranks by pgvector's negative inner product (``<#>``): the embeddings
+        are unit length, so this matches cosine order without per-row norms.
+        The query vector is bound once and ordered by its output column, which
+        the index still serves; similarity is the negated distance, and the
+        threshold is applied to the ranked rows, which keeps the same results.
+        """
+        conditions, values = self._filter_conditions(filters)
+        where_clause = " AND ".join(["summary_embedding IS NOT NULL", *conditions])
+
         with self._get_pg_connection() as conn, conn.cursor() as cursor:
-            if similarity_threshold is not None:
-                sql = """
-                    SELECT *, 1 - (summary_embedding <=> %s::vector) as similarity
-                    FROM workouts
-                    WHERE summary_embedding IS NOT NULL
-                    AND 1 - (summary_embedding <=> %s::vector) >= %s
-                    ORDER BY summary_embedding <=> %s::vector
-                    LIMIT %s
-                    """
-                cursor.execute(
-                    sql,
-                    (
-                        query_embedding,
-                        query_embedding,
-                        similarity_threshold,
-                        query_embedding,
-                        limit,
-                    ),
-                )
-            else:
-                sql = """
-                    SELECT *, 1 - (summary_embedding <=> %s::vector) as similarity
-                    FROM workouts
-                    WHERE summary_embedding IS NOT NULL
-                    ORDER BY summary_embedding <=> %s::vector
-                    LIMIT %s
-                    """
-                cursor.execute(sql, (query_embedding, query_embedding, limit))
+            self._set_hnsw_ef_search(cursor, limit, filtered=bool(conditions))
+            sql = f"""
+                SELECT *,
+                    {SUMMARY_EMBEDDING_HALF} <#> %s::halfvec(1536) as distance
+                FROM workouts
+                WHERE {where_clause}
+                ORDER BY distance
+                LIMIT %s
+                """
+            cursor.execute(sql, (format_vector(query_embedding), *values, limit))
 
             rows = cursor.fetchall()
             columns = (
                 [desc[0] for desc in cursor.description] if cursor.description else []
             )
+            if similarity_threshold is not None:
+                distance_index = columns.index("distance")
+                rows = [
+                    row for row in rows if -row[distance_index] >= similarity_threshold
+                ]
             return [(row, columns) for row in rows]
 
     def _convert_rows_to_search_results(
@@ -316,7 +459,7 @@ class WorkoutRepository:
         for row_data in rows_with_columns:
             row, columns = row_data
             row_dict = dict(zip(columns, row, strict=False))
-            similarity_score = row_dict.pop("similarity", 0.0)
+            similarity_score = -row_dict.pop("distance", 0.0)
             workout = Workout.from_dict(row_dict)
             search_results.append(
                 SearchResult(
@@ -331,20 +474,21 @@ class WorkoutRepository:
         self,
         query: str,
         limit: int = 50,
+        filters: WorkoutFilter | None = None,
+        phrase: bool = False,
     ) -> list[SearchResult]:
         """
         Full-text search using ParadeDB BM25 ranking.
 
-        Supports:
-        - "phrase search" - exact phrase matching
-        - word1 OR word2 - either term
-        - word1 AND word2 - both terms
-        - word1 NOT word2 - exclude word2
-        - Complex boolean queries
+        By default a workout matches if any query term appears in one of its
+        text fields. With phrase=True the query's words must appear together
+        and in order, as with "pogo stick".
 
         Args:
             query: Search query text
             limit: Maximum number of results
+            filters: Optional metadata filters, applied in the query
+            phrase: Match the query as an exact phrase
 
         Returns:
             List of search results ordered by BM25 score
@@ -353,23 +497,30 @@ class WorkoutRepository:
             if not query.strip():
                 return []
 
+            conditions, values = self._filter_conditions(filters)
+            where_clause = "".join(f" AND {condition}" for condition in conditions)
+
+            if phrase:
+                # Phrase queries take the tokens the index stores: lowercased words
+                term: Any = re.findall(r"\w+", query.lower())
+                clause = "paradedb.phrase('{}', %s::text[])"
+            else:
+                term = query
+                clause = "paradedb.match('{}', %s)"
+            should = ", ".join(clause.format(field) for field in TEXT_SEARCH_FIELDS)
+
             with self._get_pg_connection() as conn, conn.cursor() as cursor:
                 # Use ParadeDB's BM25 search with boolean query
-                sql = """
+                sql = f"""
                     SELECT w.*, paradedb.score(w.id) as bm25_score
                     FROM workouts w
-                    WHERE w @@@ paradedb.boolean(
-                        should => ARRAY[
-                            paradedb.match('workout', %s),
-                            paradedb.match('one_sentence_summary', %s),
-                            paradedb.match('workout_name', %s),
-                            paradedb.match('scaling', %s)
-                        ]
-                    )
+                    WHERE w @@@ paradedb.boolean(should => ARRAY[{should}])
+                    {where_clause}
                     ORDER BY bm25_score DESC
                     LIMIT %s
                     """
-                cursor.execute(sql, (query, query, query, query, limit))
+                terms = [term] * len(TEXT_SEARCH_FIELDS)
+                cursor.execute(sql, (*terms, *values, limit))
                 rows = cursor.fetchall()
 
                 # Get column names
@@ -398,100 +549,118 @@ class WorkoutRepository:
         except (psycopg2.Error, ValueError) as e:
             raise RuntimeError(f"Failed to perform BM25 search: {e}") from e
 
-    def _merge_search_results(
-        self,
-        semantic_results: list[SearchResult],
-        text_results: list[SearchResult],
-        semantic_weight: float,
-    ) -> list[SearchResult]:
-        """Merge and rerank results from semantic and text search."""
-        workout_scores: dict[int, dict[str, Any]] = {}
-
-        # Add semantic scores
-        for result in semantic_results:
-            if result.workout.id:
-                workout_scores[result.workout.id] = {
-                    "workout": result.workout,
-                    "semantic": result.similarity_score or 0.0,
-                    "text": 0.0,
-                    "combined": 0.0,
-                }
-
-        # Add text search scores (normalize rank scores)
-        if text_results:
-            # PostgreSQL ts_rank returns values typically between 0 and 1
-            # but can be higher, so we normalize
-            max_rank = max([r.similarity_score or 0 for r in text_results])
-            if max_rank > 0:
-                for result in text_results:
-                    if result.workout.id:
-                        # Normalize to 0-1 range
-                        normalized_rank = (result.similarity_score or 0) / max_rank
-
-                        if result.workout.id in workout_scores:
-                            workout_scores[result.workout.id]["text"] = normalized_rank
-                        else:
-                            workout_scores[result.workout.id] = {
-                                "workout": result.workout,
-                                "semantic": 0.0,
-                                "text": normalized_rank,
-                                "combined": 0.0,
-                            }
-
-        # Calculate combined scores
-        text_weight = 1 - semantic_weight
-        for _workout_id, scores in workout_scores.items():
-            scores["combined"] = (
-                semantic_weight * scores["semantic"] + text_weight * scores["text"]
-            )
-
-        # Sort by combined score and convert back to SearchResults
-        sorted_results = sorted(
-            workout_scores.values(), key=lambda x: x["combined"], reverse=True
-        )
-
-        return [
-            SearchResult(
-                workout=item["workout"],
-                similarity_score=item["combined"],
-                metadata_match=True,
-            )
-            for item in sorted_results
-        ]
-
     def hybrid_search(
         self,
         query_text: str,
         semantic_weight: float = 0.7,
         limit: int = 10,
+        filters: WorkoutFilter | None = None,
     ) -> list[SearchResult]:
         """
         Hybrid search combining semantic similarity and full-text search.
 
+        Both searches and the fusion run in one statement: the top semantic
+        and BM25 candidates are joined by id, BM25 scores are normalized by
+        the best one, and the weighted sum ranks the merged set.
+
         Args:
             query_text: Text to search for
             semantic_weight: Weight for semantic scores (0-1)
             limit: Maximum number of results
+            filters: Optional metadata filters, applied in both queries
 
         Returns:
             List of search results ordered by combined score
         """
         try:
-            # Get larger result sets for merging
-            semantic_limit = min(limit * 5, 50)  # Get more results for better merging
-            text_limit = min(limit * 5, 50)
+            # Get larger candidate sets for better merging
+            candidate_limit = min(limit * 5, 50)
+            query_embedding = self._generate_query_embedding(query_text)
+            conditions, values = self._filter_conditions(filters)
+            filter_clause = "".join(f" AND {condition}" for condition in conditions)
 
-            # Perform both searches
-            semantic_results = self.search_summaries(query_text, limit=semantic_limit)
-            text_results = self.text_search_workouts(query_text, limit=text_limit)
+            with self._get_pg_connection() as conn, conn.cursor() as cursor:
+                self._set_hnsw_ef_search(
+                    cursor, candidate_limit, filtered=bool(conditions)
+                )
+                sql = f"""
+                    WITH semantic AS (
+                        SELECT id,
+                            {SUMMARY_EMBEDDING_HALF} <#> %s::halfvec(1536) AS distance
+                        FROM workouts
+                        WHERE summary_embedding IS NOT NULL{filter_clause}
+                        ORDER BY distance
+                        LIMIT %s
+                    ),
+                    lexical AS (
+                        SELECT w.id, paradedb.score(w.id) AS bm25_score
+                        FROM workouts w
+                        WHERE w @@@ paradedb.boolean(
+                            should => ARRAY[
+                                paradedb.match('workout', %s),
+                                paradedb.match('one_sentence_summary', %s),
+                                paradedb.match('workout_name', %s),
+                                paradedb.match('scaling', %s)
+                            ]
+                        ){filter_clause}
+                        ORDER BY bm25_score DESC
+                        LIMIT %s
+                    ),
+                    fused AS (
+                        SELECT
+                            coalesce(semantic.id, lexical.id) AS id,
+                            %s * coalesce(-semantic.distance, 0)
+                            + (1 - %s) * coalesce(
+                                lexical.bm25_score
+                                / nullif(max(lexical.bm25_score) OVER (), 0),
+                                0
+                            ) AS hybrid_score
+                        FROM semantic
+                        FULL OUTER JOIN lexical ON semantic.id = lexical.id
+                    )
+                    SELECT w.*, fused.hybrid_score
+                    FROM fused JOIN workouts w ON w.id = fused.id
+                    ORDER BY fused.hybrid_score DESC
+                    LIMIT %s
+                    """
+                cursor.execute(
+                    sql,
+                    (
+                        format_vector(query_embedding),
+                        *values,
+                        candidate_limit,
+                        query_text,
+                        query_text,
+                        query_text,
+                        query_text,
+                        *values,
+                        candidate_limit,
+                        semantic_weight,
+                        semantic_weight,
+                        limit,
+                    ),
+                )
+                rows = cursor.fetchall()
+                columns = (
+                    [desc[0] for desc in cursor.description]
+                    if cursor.description
+                    else []
+                )
 
-            # Merge and rerank
-            merged_results = self._merge_search_results(
-                semantic_results, text_results, semantic_weight
-            )
+            search_results = []
+            for row in rows:
+                row_dict = dict(zip(columns, row, strict=False))
+                hybrid_score = row_dict.pop("hybrid_score", 0.0)
+                workout = Workout.from_dict(row_dict)
+                search_results.append(
+                    SearchResult(
+                        workout=workout,
+                        similarity_score=hybrid_score,
+                        metadata_match=True,
+                    )
+                )
 
-            # Return top N results
-            return merged_results[:limit]
+            return search_results
 
         except (psycopg2.Error, ValueError) as e:
             raise RuntimeError(f"Failed to perform hybrid search: {e}") from e
@@ -500,6 +669,7 @@ class WorkoutRepository:
         self,
         query_text: str,
         limit: int = 10,
+        filters: WorkoutFilter | None = None,
     ) -> list[SearchResult]:
         """
         Search workouts by semantic similarity on one_sentence_summary field.
@@ -507,6 +677,7 @@ class WorkoutRepository:
         Args:
             query_text: Text to search for
             limit: Maximum number of results
+            filters: Optional metadata filters, applied in the query
 
         Returns:
             List of search results ordered by similarity
@@ -514,12 +685,65 @@ class WorkoutRepository:
         try:
             query_embedding = self._generate_query_embedding(query_text)
             rows_with_columns = self._execute_vector_similarity_query(
-                query_embedding, limit
+                query_embedding, limit, filters=filters
             )
             return self._convert_rows_to_search_results(rows_with_columns)
         except (psycopg2.Error, ValueError) as e:
             raise RuntimeError(f"Failed to search summaries: {e}") from e
 
+    def iter_search_summaries(
+        self,
+        query_text: str,
+        limit: int = 10,
+        filters: WorkoutFilter | None = None,
+    ) -> Generator[SearchResult, None, None]:
+        """
+        Stream search_summaries results as the database produces them.
+
+        Rows come from a server-side cursor ten at a time, so callers can show
+        the first result before the rest are fetched and never hold them all.
+
+        Args:
+            query_text: Text to search for
+            limit: Maximum number of results
+            filters: Optional metadata filters, applied in the query
+
+        Yields:
+            Search results ordered by similarity
+        """
+        try:
+            query_embedding = self._generate_query_embedding(query_text)
+            conditions, values = self._filter_conditions(filters)
+            where_clause = " AND ".join(["summary_embedding IS NOT NULL", *conditions])
+
+            with self._get_pg_connection() as conn:
+                with conn.cursor() as cursor:
+                    self._set_hnsw_ef_search(cursor, limit, filtered=bool(conditions))
+                with conn.cursor(name="search_stream") as cursor:
+                    cursor.itersize = 10
+                    sql = f"""
+                        SELECT *,
+                            {SUMMARY_EMBEDDING_HALF} <#> %s::halfvec(1536) as distance
+                        FROM workouts
+                        WHERE {where_clause}
+                        ORDER BY distance
+                        LIMIT %s
+                        """
+                    cursor.execute(
+                        sql, (format_vector(query_embedding), *values, limit)
+                    )
+
+                    columns: list[str] = []
+                    for row in cursor:
+                        # A named cursor has no description until the first fetch
+                        if not columns:
+                            columns = [desc[0] for desc in cursor.description]
+                        yield from self._convert_rows_to_search_results(
+                            [(row, columns)]
+                        )
+        except (psycopg2.Error, ValueError) as e:
+            raise RuntimeError(f"Failed to search summaries: {e}") from e
+
     def vector_search(
         self,
         query_embedding: list[float],
@@ -527,49 +751,10 @@ class WorkoutRepository:
         similarity_threshold: float = 0.7,
     ) -> list[SearchResult]:
         try:
-            # Execute raw SQL with vector similarity using psycopg2
-            with self._get_pg_connection() as conn, conn.cursor() as cursor:
-                sql = """
-                    SELECT *, 1 - (summary_embedding <=> %s::vector) as similarity
-                    FROM workouts
-                    WHERE summary_embedding IS NOT NULL
-                    AND 1 - (summary_embedding <=> %s::vector) >= %s
-                    ORDER BY summary_embedding <=> %s::vector
-                    LIMIT %s
-                    """
-                cursor.execute(
-                    sql,
-                    (
-                        query_embedding,
-                        query_embedding,
-                        similarity_threshold,
-                        query_embedding,
-                        limit,
-                    ),
-                )
-                rows = cursor.fetchall()
-
-                # Get column names
-                columns = (
-                    [desc[0] for desc in cursor.description]
-                    if cursor.description
-                    else []
-                )
-
-            search_results = []
-            for row in rows:
-                row_dict = dict(zip(columns, row, strict=False))
-                workout = Workout.from_dict(row_dict)
-                similarity_score = row_dict.get("similarity", 0.0)
-                search_results.append(
-                    SearchResult(
-                        workout=workout,
-                        similarity_score=similarity_score,
-                        metadata_match=True,
-                    )
-                )
-
-            return search_results
+            rows_with_columns = self._execute_vector_similarity_query(
+                query_embedding, limit, similarity_threshold=similarity_threshold
+            )
+            return self._convert_rows_to_search_results(rows_with_columns)
         except (psycopg2.Error, ValueError) as e:
             raise RuntimeError(f"Failed to perform vector search: {e}") from e
 
@@ -628,48 +813,7 @@ class WorkoutRepository:
         """Filter workouts using PostgreSQL."""
         try:
             with self._get_pg_connection() as conn, conn.cursor() as cursor:
-                where_clauses = []
-                values: list[Any] = []
-
-                if filters.movements:
-                    # Check if any of the filter movements match
-                    movement_conditions = []
-                    for movement in filters.movements:
-                        movement_conditions.append("%s = ANY(movements)")
-                        values.append(movement)
-                    where_clauses.append(f"({' OR '.join(movement_conditions)})")
-
-                if filters.equipment:
-                    # Check if any of the filter equipment match
-                    equipment_conditions = []
-                    for equip in filters.equipment:
-                        equipment_conditions.append("%s = ANY(equipment)")
-                        values.append(equip)
-                    where_clauses.append(f"({' OR '.join(equipment_conditions)})")
-
-                if filters.workout_type:
-                    where_clauses.append("workout_type = %s")
-                    values.append(filters.workout_type)
-
-                if filters.workout_name:
-                    where_clauses.append("workout_name ILIKE %s")
-                    values.append(f"%{filters.workout_name}%")
-
-                if filters.start_date:
-                    where_clauses.append("date >= %s")
-                    values.append(filters.start_date)
-
-                if filters.end_date:
-                    where_clauses.append("date <= %s")
-                    values.append(filters.end_date)
-
-                if filters.has_video is not None:
-                    where_clauses.append("has_video = %s")
-                    values.append(filters.has_video)
-
-                if filters.has_article is not None:
-                    where_clauses.append("has_article = %s")
-                    values.append(filters.has_article)
+                where_clauses, values = self._filter_conditions(filters)
 
                 # Build query
                 base_query = "SELECT * FROM workouts"
@@ -710,47 +854,7 @@ class WorkoutRepository:
         try:
             with self._get_pg_connection() as conn, conn.cursor() as cursor:
                 # Build WHERE clause if filters provided
-                where_clauses = []
-                values: list[Any] = []
-
-                if filters:
-                    if filters.movements:
-                        movement_conditions = []
-                        for movement in filters.movements:
-                            movement_conditions.append("%s = ANY(movements)")
-                            values.append(movement)
-                        where_clauses.append(f"({' OR '.join(movement_conditions)})")
-
-                    if filters.equipment:
-                        equipment_conditions = []
-                        for equip in filters.equipment:
-                            equipment_conditions.append("%s = ANY(equipment)")
-                            values.append(equip)
-                        where_clauses.append(f"({' OR '.join(equipment_conditions)})")
-
-                    if filters.workout_type:
-                        where_clauses.append("workout_type = %s")
-                        values.append(filters.workout_type)
-
-                    if filters.workout_name:
-                        where_clauses.append("workout_name ILIKE %s")
-                        values.append(f"%{filters.workout_name}%")
-
-                    if filters.start_date:
-                        where_clauses.append("date >= %s")
-                        values.append(filters.start_date)
-
-                    if filters.end_date:
-                        where_clauses.append("date <= %s")
-                        values.append(filters.end_date)
-
-                    if filters.has_video is not None:
-                        where_clauses.append("has_video = %s")
-                        values.append(filters.has_video)
-
-                    if filters.has_article is not None:
-                        where_clauses.append("has_article = %s")
-                        values.append(filters.has_article)
+                where_clauses, values = self._filter_conditions(filters)
 
                 # Build WHERE clause
                 where_clause = ""
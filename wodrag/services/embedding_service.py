@@ -1,33 +1,232 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import random
+import threading
+from collections import OrderedDict
 
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+# Most inputs the embeddings endpoint accepts in one request
+MAX_BATCH_INPUTS = 2048
+# Soft cap on tokens per request, kept below the endpoint's 300k limit
+MAX_BATCH_TOKENS = 280_000
+# Rough English token size used to estimate tokens without a tokenizer
+CHARS_PER_TOKEN = 4
+# Embedding requests kept in flight at once by the async batch method
+DEFAULT_PARALLELISM = int(os.environ.get("EMBEDDER_PARALLELISM", "4"))
+# Backoff schedule for retrying rate-limited or transient request failures
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MULTIPLIER = 2.0
+BACKOFF_JITTER = 0.25
+# Successful requests needed before a halved concurrency limit grows by one
+RECOVERY_SUCCESSES = 10
+# Query embeddings kept in memory across EmbeddingService instances
+QUERY_CACHE_SIZE = 1024
+
+
+def chunk_texts(texts: list[str]) -> list[list[str]]:
+    """
+    Split texts into request-sized chunks.
+
+    Each chunk holds at most MAX_BATCH_INPUTS texts and roughly
+    MAX_BATCH_TOKENS tokens, estimated from character counts.
+
+    Args:
+        texts: Texts to split, in order
+
+    Returns:
+        Consecutive chunks that together contain every text once
+    """
+    max_chars = MAX_BATCH_TOKENS * CHARS_PER_TOKEN
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    current_chars = 0
+
+    for text in texts:
+        if current and (
+            len(current) >= MAX_BATCH_INPUTS or current_chars + len(text) > max_chars
+        ):
+            chunks.append(current)
+            current = []
+            current_chars = 0
+        current.append(text)
+        current_chars += len(text)
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that halves on rate limiting and recovers gradually."""
+
+    def __init__(self, limit: int, recovery_successes: int = RECOVERY_SUCCESSES):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Maximum number of requests in flight
+            recovery_successes: Successes needed to raise a reduced limit by one
+        """
+        self.max_limit = max(1, limit)
+        self.limit = self.max_limit
+        self.recovery_successes = recovery_successes
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait until a request slot is free under the current limit."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self, rate_limited: bool = False) -> None:
+        """
+        Free a request slot and adapt the limit to how the request went.
+
+        Args:
+            rate_limited: Whether the request was rejected with a 429
+        """
+        async with self._condition:
+            self._in_flight -= 1
+            if rate_limited:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if (
+                    self.limit < self.max_limit
+                    and self._successes >= self.recovery_successes
+                ):
+                    self.limit += 1
+                    self._successes = 0
+            self._condition.notify_all()
+
+
+class EmbeddingCache:
+    """Thread-safe LRU cache of embeddings keyed by (model, text)."""
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Most embeddings kept before evicting the least recently used
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, str], tuple[float, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model: str, text: str) -> list[float] | None:
+        """Return a copy of the cached embedding, or None on a miss."""
+        with self._lock:
+            embedding = self._entries.get((model, text))
+            if embedding is None:
+                return None
+            self._entries.move_to_end((model, text))
+        return list(embedding)
+
+    def put(self, model: str, text: str, embedding: list[float]) -> None:
+        """Cache an embedding, evicting the least recently used if full."""
+        with self._lock:
+            self._entries[(model, text)] = tuple(embedding)
+            self._entries.move_to_end((model, text))
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached embedding."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by every EmbeddingService: the API builds a service per request, and
+# users and scripts repeat the same search queries
+query_embedding_cache = EmbeddingCache()
+
+
+def retry_delay(error: openai.APIError, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a failed request.
+
+    Uses the server's Retry-After header when present, otherwise exponential
+    backoff with jitter.
+
+    Args:
+        error: The error raised by the request
+        attempt: Zero-based number of the attempt that failed
+
+    Returns:
+        Delay in seconds
+    """
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+
+    delay = BACKOFF_BASE * BACKOFF_MULTIPLIER**attempt
+    return delay * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
 
 
 class EmbeddingService:
     """Service for generating text embeddings using OpenAI."""
 
-    def __init__(self, model: str = "text-embedding-3-small"):
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        parallelism: int = DEFAULT_PARALLELISM,
+    ):
         """
         Initialize the embedding service.
 
         Args:
             model: OpenAI embedding model to use
+            parallelism: Maximum concurrent requests for async batch embedding
         """
         self.model = model
+        self.parallelism = parallelism
         # Initialize OpenAI client with API key from environment
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
 
         self.client = OpenAI(api_key=api_key)
+        # Retries are handled by generate_batch_embeddings_async so that
+        # rate limiting can also shrink the number of requests in flight
+        self.async_client = AsyncOpenAI(api_key=api_key, max_retries=0)
+        # Created on first async use and kept, so backoff carries across calls
+        self._limiter: AdaptiveLimiter | None = None
+        self._limiter_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_limiter(self) -> AdaptiveLimiter:
+        """Return this service's limiter for the running event loop.
+
+        Reusing one limiter means a 429 in one call keeps later calls slowed
+        down too. It is rebuilt only for a new event loop, since its
+        condition variable is bound to the loop it was first used on.
+        """
+        loop = asyncio.get_running_loop()
+        if self._limiter is None or self._limiter_loop is not loop:
+            self._limiter = AdaptiveLimiter(self.parallelism)
+            self._limiter_loop = loop
+        return self._limiter
 
     def generate_embedding(self, text: str) -> list[float]:
         """
         Generate an embedding for a single text.
 
+        Results are kept in the shared query_embedding_cache, so repeating a
+        query (after stripping whitespace) skips the API call.
+
         Args:
             text: Text to embed
 
@@ -40,17 +239,25 @@ class EmbeddingService:
         if not text or not text.strip():
             raise ValueError("Text cannot be empty")
 
+        text = text.strip()
+        cached = query_embedding_cache.get(self.model, text)
+        if cached is not None:
+            return cached
+
         try:
-            response = self.client.embeddings.create(
-                model=self.model, input=text.strip()
-            )
-            return response.data[0].embedding
+            response = self.client.embeddings.create(model=self.model, input=text)
+            embedding = response.data[0].embedding
         except (openai.OpenAIError, ValueError) as e:
             raise RuntimeError(f"Failed to generate embedding: {e}") from e
 
+        query_embedding_cache.put(self.model, text, embedding)
+        return embedding
+
     def generate_batch_embeddings(self, texts: list[str]) -> list[list[float]]:
         """
-        Generate embeddings for multiple texts in a single API call.
+        Generate embeddings for multiple texts with as few API calls as possible.
+
+        Texts are sent in chunks that fit the endpoint's per-request limits.
 
         Args:
             texts: List of texts to embed
@@ -64,32 +271,104 @@ class EmbeddingService:
         if not texts:
             return []
 
-        # Filter out empty texts and keep track of indices
-        non_empty_texts = []
-        text_indices = []
+        non_empty_texts, text_indices = _non_empty_texts(texts)
 
-        for i, text in enumerate(texts):
-            if text and text.strip():
-                non_empty_texts.append(text.strip())
-                text_indices.append(i)
+        try:
+            batch_embeddings: list[list[float]] = []
+            for chunk in chunk_texts(non_empty_texts):
+                response = self.client.embeddings.create(model=self.model, input=chunk)
+                batch_embeddings.extend(data.embedding for data in response.data)
 
-        if not non_empty_texts:
-            raise ValueError("All texts are empty")
+            return _scatter_embeddings(len(texts), text_indices, batch_embeddings)
 
-        try:
-            response = self.client.embeddings.create(
-                model=self.model, input=non_empty_texts
-            )
+        except (openai.OpenAIError, ValueError) as e:
+            raise RuntimeError(f"Failed to generate batch embeddings: {e}") from e
+
+    async def generate_batch_embeddings_async(
+        self, texts: list[str]
+    ) -> list[list[float]]:
+        """
+        Generate embeddings for multiple texts, sending chunks concurrently.
+
+        Chunks are split as in generate_batch_embeddings, and up to
+        ``parallelism`` requests are in flight at once. Rate-limited and
+        transient failures are retried with backoff, and each 429 halves the
+        number of requests in flight until enough requests succeed again,
+        across calls on this service.
+
+        Args:
+            texts: List of texts to embed
 
-            # Create result list with same length as input
-            embeddings: list[list[float]] = [[] for _ in texts]
+        Returns:
+            List of embedding vectors in the same order as input texts
+
+        Raises:
+            RuntimeError: If embedding generation fails
+        """
+        if not texts:
+            return []
 
-            # Fill in embeddings for non-empty texts
-            for i, embedding_data in enumerate(response.data):
-                original_index = text_indices[i]
-                embeddings[original_index] = embedding_data.embedding
+        non_empty_texts, text_indices = _non_empty_texts(texts)
+        limiter = self._get_limiter()
 
-            return embeddings
+        async def embed_chunk(chunk: list[str]) -> list[list[float]]:
+            attempt = 0
+            while True:
+                await limiter.acquire()
+                rate_limited = False
+                try:
+                    response = await self.async_client.embeddings.create(
+                        model=self.model, input=chunk
+                    )
+                    return [data.embedding for data in response.data]
+                except (
+                    openai.RateLimitError,
+                    openai.APIConnectionError,
+                    openai.InternalServerError,
+                ) as e:
+                    rate_limited = isinstance(e, openai.RateLimitError)
+                    attempt += 1
+                    if attempt >= MAX_ATTEMPTS:
+                        raise
+                    delay = retry_delay(e, attempt - 1)
+                finally:
+                    await limiter.release(rate_limited=rate_limited)
+                await asyncio.sleep(delay)
+
+        try:
+            # gather preserves chunk order, so results line up with the input
+            results = await asyncio.gather(
+                *(embed_chunk(chunk) for chunk in chunk_texts(non_empty_texts))
+            )
+            batch_embeddings = [embedding for chunk in results for embedding in chunk]
+
+            return _scatter_embeddings(len(texts), text_indices, batch_embeddings)
 
         except (openai.OpenAIError, ValueError) as e:
             raise RuntimeError(f"Failed to generate batch embeddings: {e}") from e
+
+
+def _non_empty_texts(texts: list[str]) -> tuple[list[str], list[int]]:
+    """Strip texts, dropping empty ones, and return them with their indices."""
+    non_empty_texts = []
+    text_indices = []
+
+    for i, text in enumerate(texts):
+        if text and text.strip():
+            non_empty_texts.append(text.strip())
+            text_indices.append(i)
+
+    if not non_empty_texts:
+        raise ValueError("All texts are empty")
+
+    return non_empty_texts, text_indices
+
+
+def _scatter_embeddings(
+    count: int, text_indices: list[int], batch_embeddings: list[list[float]]
+) -> list[list[float]]:
+    """Place embeddings back at their original indices; empty texts get []."""
+    embeddings: list[list[float]] = [[] for _ in range(count)]
+    for original_index, embedding in zip(text_indices, batch_embeddings, strict=True):
+        embeddings[original_index] = embedding
+    return embeddings
@@ -1,6 +1,7 @@
 import json
 import pathlib
 import random
+import re
 
 root_directory = pathlib.Path(__file__).parent.parent
 json_directory = root_directory / "data" / "processed" / "json"
@@ -19,3 +20,20 @@ def sample_workouts(n: int = 500, seed: int = 12) -> list:
     sample = random.sample(sample, n)
 
     return sample
+
+
+def quoted_phrase(query: str) -> str | None:
+    """Return the text inside a query wrapped in double quotes, else None."""
+    query = query.strip()
+    if len(query) > 2 and query.startswith('"') and query.endswith('"'):
+        return query[1:-1].strip() or None
+    return None
+
+
+def is_exact_lexical_query(query: str) -> bool:
+    """Whether BM25 alone answers the query: a quoted phrase such as
+    "pogo stick", or a single capitalized name such as Fran. Embedding these
+    adds an API call and a vector scan without improving the ranking."""
+    if quoted_phrase(query) is not None:
+        return True
+    return re.fullmatch(r"[A-Z][a-zA-Z]+", query.strip()) is not None